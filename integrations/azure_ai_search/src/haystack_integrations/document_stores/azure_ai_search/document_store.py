@@ -1,11 +1,13 @@
 # SPDX-FileCopyrightText: 2023-present deepset GmbH <info@deepset.ai>
 #
 # SPDX-License-Identifier: Apache-2.0
+import json
 import logging
+import math
 import os
-from dataclasses import asdict
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Literal, Optional, Set, Tuple, Union, get_args, get_origin
 
 from azure.core.credentials import AzureKeyCredential
 from azure.core.exceptions import ClientAuthenticationError, HttpResponseError, ResourceNotFoundError
@@ -24,13 +26,14 @@ from azure.search.documents.indexes.models import (
     VectorSearchAlgorithmMetric,
     VectorSearchProfile,
 )
-from azure.search.documents.models import VectorizedQuery
+from azure.search.documents.models import IndexingResult, VectorizedQuery
 from haystack import default_from_dict, default_to_dict
 from haystack.dataclasses import Document
+from haystack.document_stores.errors import DuplicateDocumentError
 from haystack.document_stores.types import DuplicatePolicy
 from haystack.utils import Secret, deserialize_secrets_inplace
 
-from .errors import AzureAISearchDocumentStoreConfigError
+from .errors import AzureAISearchDocumentStoreConfigError, AzureAISearchDocumentStoreError
 from .filters import _normalize_filters
 
 type_mapping = {
@@ -41,6 +44,22 @@ type_mapping = {
     datetime: "Edm.DateTimeOffset",
 }
 
+
+def _get_azure_field_type(value_type: Any) -> Optional[str]:
+    """
+    Returns the Azure Search field type of a metadata type, or None if the type is not supported.
+
+    Besides the types in `type_mapping`, lists of them (e.g. `List[str]`) are mapped to collections.
+    """
+    if get_origin(value_type) is list:
+        item_types = get_args(value_type)
+        item_field_type = type_mapping.get(item_types[0]) if len(item_types) == 1 else None
+        return SearchFieldDataType.Collection(item_field_type) if item_field_type else None
+    return type_mapping.get(value_type)
+
+
+# The HNSW parameters are spelled out so that they are visible and easy to start tuning from.
+# Azure AI Search accepts `m` in [4, 10], and `ef_construction` and `ef_search` in [100, 1000].
 DEFAULT_VECTOR_SEARCH = VectorSearch(
     profiles=[
         VectorSearchProfile(name="default-vector-config", algorithm_configuration_name="cosine-algorithm-config")
@@ -49,17 +68,108 @@ DEFAULT_VECTOR_SEARCH = VectorSearch(
         HnswAlgorithmConfiguration(
             name="cosine-algorithm-config",
             parameters=HnswParameters(
+                m=4,
+                ef_construction=400,
+                ef_search=500,
                 metric=VectorSearchAlgorithmMetric.COSINE,
             ),
         )
     ],
 )
 
+# Used with `normalize_embeddings=True`: on unit-length vectors the dot product ranks like the cosine similarity,
+# but it is cheaper to compute, as the norms of the vectors are not computed again for every comparison.
+DOT_PRODUCT_VECTOR_SEARCH = VectorSearch(
+    profiles=[
+        VectorSearchProfile(name="default-vector-config", algorithm_configuration_name="dot-product-algorithm-config")
+    ],
+    algorithms=[
+        HnswAlgorithmConfiguration(
+            name="dot-product-algorithm-config",
+            parameters=HnswParameters(
+                m=4,
+                ef_construction=400,
+                ef_search=500,
+                metric=VectorSearchAlgorithmMetric.DOT_PRODUCT,
+            ),
+        )
+    ],
+)
+
+# Fields of the index that are not metadata
+DEFAULT_FIELD_NAMES = {"id", "content", "embedding", "has_embedding"}
+
+# Field types used to store the embeddings, by `embedding_dtype`.
+# Azure AI Search stores `Edm.Half` vectors in half the space of `Edm.Single` ones.
+EMBEDDING_DTYPE_TO_FIELD_TYPE = {
+    "single": SearchFieldDataType.Collection(SearchFieldDataType.Single),
+    "half": SearchFieldDataType.Collection("Edm.Half"),
+}
+
+# Limits of a single indexing request in Azure AI Search: 32000 documents and a 16 MB payload.
+# The byte limit is kept slightly lower to leave room for the request envelope.
+MAX_UPLOAD_BATCH_SIZE = 32000
+MAX_UPLOAD_BATCH_BYTES = 15 * 1024 * 1024
+
+# Maximum number of ids looked up with a single `search.in` filter,
+# and maximum number of those lookups running concurrently
+MAX_ID_LOOKUP_BATCH_SIZE = 1000
+MAX_ID_LOOKUP_WORKERS = 8
+
+# Retry settings of the Azure clients writing to the index. The service answers with 429 or 503 when it is
+# throttling requests; those responses are retried by default, but only 3 times and with a short backoff,
+# which is not enough to get through a bulk ingestion.
+# Queries keep the default retry settings, so that they don't wait for minutes before failing.
+RETRY_POLICY_KWARGS = {"retry_total": 10, "retry_status": 10, "retry_backoff_factor": 2.0}
+
 logger = logging.getLogger(__name__)
 logging.getLogger("azure").setLevel(logging.ERROR)
 logging.getLogger("azure.identity").setLevel(logging.DEBUG)
 
 
+def _build_id_filter(document_ids: List[str]) -> str:
+    """
+    Builds an OData filter matching any of the given document ids.
+
+    `search.in` is used whenever possible, as it is much faster than a chain of `eq` comparisons.
+    Ids containing the `search.in` delimiter fall back to the chain of comparisons.
+    """
+    escaped_ids = [doc_id.replace("'", "''") for doc_id in document_ids]
+    if any("," in doc_id for doc_id in escaped_ids):
+        return " or ".join(f"id eq '{doc_id}'" for doc_id in escaped_ids)
+    return f"search.in(id, '{','.join(escaped_ids)}', ',')"
+
+
+def _normalize_vector(vector: List[float]) -> List[float]:
+    """
+    Scales the vector to unit length. Zero vectors are returned unchanged.
+    """
+    norm = math.hypot(*vector)
+    if norm == 0:
+        return vector
+    return [value / norm for value in vector]
+
+
+def _chunk_by_size(documents: List[Dict[str, Any]], max_docs: int, max_bytes: int) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Splits the documents into chunks holding at most `max_docs` documents and about `max_bytes` of JSON payload.
+
+    A single document larger than `max_bytes` is yielded on its own.
+    """
+    chunk: List[Dict[str, Any]] = []
+    chunk_bytes = 0
+    for document in documents:
+        document_bytes = len(json.dumps(document, default=str))
+        if chunk and (len(chunk) >= max_docs or chunk_bytes + document_bytes > max_bytes):
+            yield chunk
+            chunk = []
+            chunk_bytes = 0
+        chunk.append(document)
+        chunk_bytes += document_bytes
+    if chunk:
+        yield chunk
+
+
 class AzureAISearchDocumentStore:
     def __init__(
         self,
@@ -70,6 +180,9 @@ class AzureAISearchDocumentStore:
         embedding_dimension: int = 768,
         metadata_fields: Optional[Dict[str, type]] = None,
         vector_search_configuration: VectorSearch = None,
+        max_upload_batch_size: int = MAX_UPLOAD_BATCH_SIZE,
+        embedding_dtype: Literal["single", "half"] = "single",
+        normalize_embeddings: bool = False,
         **index_creation_kwargs,
     ):
         """
@@ -83,9 +196,24 @@ class AzureAISearchDocumentStore:
         :param metadata_fields: A dictionary of metadata keys and their types to create
             additional fields in index schema. As fields in Azure SearchIndex cannot be dynamic,
             it is necessary to specify the metadata fields in advance.
-            (e.g. metadata_fields = {"author": str, "date": datetime})
+            (e.g. metadata_fields = {"author": str, "date": datetime, "tags": List[str]})
         :param vector_search_configuration: Configuration option related to vector search.
             Default configuration uses the HNSW algorithm with cosine similarity to handle vector searches.
+            To trade recall for latency or index size, pass a configuration with different `HnswParameters`:
+            a higher `m` and `ef_construction` improve recall at the cost of a bigger and slower to build index,
+            while a lower `ef_search` makes queries faster at the cost of recall.
+        :param max_upload_batch_size: Maximum number of documents sent to the index in a single request.
+            Batches are also split so that their payload stays below the 16 MB request limit of Azure AI Search.
+        :param embedding_dtype: Precision used to store the embeddings in the index.
+            `"single"` stores 32-bit floats, `"half"` stores 16-bit floats, halving the size of the vector index
+            at the cost of a slightly lower precision. It is only used when the index is created.
+            To further compress the vectors, pass a `vector_search_configuration` defining scalar or binary
+            quantization in its `compressions`.
+        :param normalize_embeddings: Whether to scale the embeddings to unit length before writing them.
+            Query embeddings are normalized as well. Unless a `vector_search_configuration` is given, the index
+            is then created with the dot product metric, which ranks normalized vectors like the cosine similarity
+            but is faster to compute. Indexes created with the dot product metric expect normalized embeddings:
+            writing to them with `normalize_embeddings=False` gives wrong results.
 
         :param index_creation_kwargs: Optional keyword parameters to be passed to `SearchIndex` class
             during index creation. Some of the supported parameters:
@@ -105,89 +233,129 @@ class AzureAISearchDocumentStore:
 
         api_key = api_key or os.environ.get("AZURE_SEARCH_API_KEY") or None
 
-        self._client = None
-        self._index_client = None
-        self._index_fields = []  # type: List[Any]  # stores all fields in the final schema of index
+        if embedding_dtype not in EMBEDDING_DTYPE_TO_FIELD_TYPE:
+            msg = f"embedding_dtype must be one of {list(EMBEDDING_DTYPE_TO_FIELD_TYPE)}, but got {embedding_dtype}"
+            raise ValueError(msg)
+
+        self._client: Optional[SearchClient] = None
+        self._write_client: Optional[SearchClient] = None
+        self._index_client: Optional[SearchIndexClient] = None
+        self._index_fields: Set[str] = set()  # stores all fields in the final schema of index
         self._api_key = api_key
         self._azure_endpoint = azure_endpoint
         self._index_name = index_name
         self._embedding_dimension = embedding_dimension
         self._dummy_vector = [-10.0] * self._embedding_dimension
         self._metadata_fields = metadata_fields
-        self._vector_search_configuration = vector_search_configuration or DEFAULT_VECTOR_SEARCH
+        self._vector_search_configuration = vector_search_configuration or (
+            DOT_PRODUCT_VECTOR_SEARCH if normalize_embeddings else DEFAULT_VECTOR_SEARCH
+        )
+        self._max_upload_batch_size = max_upload_batch_size
+        self._embedding_dtype = embedding_dtype
+        self._normalize_embeddings = normalize_embeddings
         self._index_creation_kwargs = index_creation_kwargs
 
-    @property
-    def client(self) -> SearchClient:
-
-        # resolve secrets for authentication
+    def _resolve_endpoint_and_credential(self) -> Tuple[str, Union[AzureKeyCredential, DefaultAzureCredential]]:
+        """
+        Resolves the secrets used to authenticate with the Azure AI Search service.
+        """
         resolved_endpoint = (
             self._azure_endpoint.resolve_value() if isinstance(self._azure_endpoint, Secret) else self._azure_endpoint
         )
         resolved_key = self._api_key.resolve_value() if isinstance(self._api_key, Secret) else self._api_key
 
         credential = AzureKeyCredential(resolved_key) if resolved_key else DefaultAzureCredential()
+        return resolved_endpoint, credential
+
+    @property
+    def client(self) -> SearchClient:
+        # The index is checked (and created) only once, when the client is first built
+        if self._client is not None:
+            return self._client
+
+        resolved_endpoint, credential = self._resolve_endpoint_and_credential()
         try:
             if not self._index_client:
-                self._index_client = SearchIndexClient(
-                    resolved_endpoint,
-                    credential,
-                )
-            if not self._index_exists(self._index_name):
+                self._index_client = SearchIndexClient(resolved_endpoint, credential, **RETRY_POLICY_KWARGS)
+            try:
+                # A single lookup both checks that the index exists and returns its fields
+                index = self._index_client.get_index(self._index_name)
+            except ResourceNotFoundError:
                 # Create a new index if it does not exist
                 logger.debug(
                     "The index '%s' does not exist. A new index will be created.",
                     self._index_name,
                 )
-                self._create_index(self._index_name)
+                index = self._create_index(self._index_name)
         except (HttpResponseError, ClientAuthenticationError) as error:
             msg = f"Failed to authenticate with Azure Search: {error}"
             raise AzureAISearchDocumentStoreConfigError(msg) from error
 
         if self._index_client:
             # Get the search client, if index client is initialized
-            index_fields = self._index_client.get_index(self._index_name).fields
-            self._index_fields = [field.name for field in index_fields]
+            self._index_fields = {field.name for field in index.fields}
             self._client = self._index_client.get_search_client(self._index_name)
+            self._write_client = self._index_client.get_search_client(self._index_name, **RETRY_POLICY_KWARGS)
         else:
             msg = "Search Index Client is not initialized."
             raise AzureAISearchDocumentStoreConfigError(msg)
 
         return self._client
 
-    def _create_index(self, index_name: str) -> None:
+    @property
+    def write_client(self) -> SearchClient:
         """
-        Creates a new search index.
-        :param index_name: Name of the index to create. If None, the index name from the constructor is used.
-        :param kwargs: Optional keyword parameters.
+        The client used to write to the index, which retries throttled requests with a longer backoff.
         """
+        if self._write_client is None:
+            # The clients are built together with the search client
+            _ = self.client
+            if self._write_client is None:
+                msg = "Search Client is not initialized."
+                raise AzureAISearchDocumentStoreConfigError(msg)
+        return self._write_client
+
+    def _build_default_fields(self) -> List[SearchField]:
+        """
+        Builds the fields of the index that store the Haystack Document (id, content, embedding).
 
-        # default fields to create index based on Haystack Document (id, content, embedding)
-        default_fields = [
+        A new list is returned on every call, so that callers can extend it.
+        """
+        # `has_embedding` marks the documents without embedding, whose vector is left empty
+        return [
             SimpleField(name="id", type=SearchFieldDataType.String, key=True, filterable=True),
             SearchableField(name="content", type=SearchFieldDataType.String),
             SearchField(
                 name="embedding",
-                type=SearchFieldDataType.Collection(SearchFieldDataType.Single),
+                type=EMBEDDING_DTYPE_TO_FIELD_TYPE[self._embedding_dtype],
                 searchable=True,
                 hidden=False,
                 vector_search_dimensions=self._embedding_dimension,
                 vector_search_profile_name="default-vector-config",
             ),
+            SimpleField(name="has_embedding", type=SearchFieldDataType.Boolean, filterable=True),
         ]
 
+    def _create_index(self, index_name: str) -> SearchIndex:
+        """
+        Creates a new search index.
+        :param index_name: Name of the index to create. If None, the index name from the constructor is used.
+        :param kwargs: Optional keyword parameters.
+        :returns: The created index, as returned by the service.
+        """
+
         if not index_name:
             index_name = self._index_name
-        if self._metadata_fields:
-            default_fields.extend(self._create_metadata_index_fields(self._metadata_fields))
+        metadata_fields = self._create_metadata_index_fields(self._metadata_fields) if self._metadata_fields else []
         index = SearchIndex(
             name=index_name,
-            fields=default_fields,
+            fields=[*self._build_default_fields(), *metadata_fields],
             vector_search=self._vector_search_configuration,
             **self._index_creation_kwargs,
         )
         if self._index_client:
-            self._index_client.create_index(index)
+            return self._index_client.create_index(index)
+        return index
 
     def to_dict(self) -> Dict[str, Any]:
         # This is not the best solution to serialise this class but is the fastest to implement.
@@ -207,6 +375,9 @@ class AzureAISearchDocumentStore:
             embedding_dimension=self._embedding_dimension,
             metadata_fields=self._metadata_fields,
             vector_search_configuration=self._vector_search_configuration.as_dict(),
+            max_upload_batch_size=self._max_upload_batch_size,
+            embedding_dtype=self._embedding_dtype,
+            normalize_embeddings=self._normalize_embeddings,
             **self._index_creation_kwargs,
         )
 
@@ -240,15 +411,19 @@ class AzureAISearchDocumentStore:
         Writes the provided documents to search index.
 
         :param documents: documents to write to the index.
+        :param policy: the duplicate policy to use when writing documents.
+            `DuplicatePolicy.NONE` and `DuplicatePolicy.OVERWRITE` overwrite the existing documents,
+            `DuplicatePolicy.SKIP` keeps them and `DuplicatePolicy.FAIL` raises an error.
+        :raises DuplicateDocumentError: If a document with the same id already exists in the index
+            and the policy is set to `DuplicatePolicy.FAIL`.
         :return: the number of documents added to index.
         """
 
-        def _convert_input_document(documents: Document):
-            document_dict = asdict(documents)
-            if not isinstance(document_dict["id"], str):
-                msg = f"Document id {document_dict['id']} is not a string, "
+        def _convert_input_document(document: Document):
+            if not isinstance(document.id, str):
+                msg = f"Document id {document.id} is not a string, "
                 raise Exception(msg)
-            index_document = self._convert_haystack_documents_to_azure(document_dict)
+            index_document = self._convert_haystack_documents_to_azure(document)
 
             return index_document
 
@@ -257,29 +432,66 @@ class AzureAISearchDocumentStore:
                 msg = "param 'documents' must contain a list of objects of type Document"
                 raise ValueError(msg)
 
-        if policy not in [DuplicatePolicy.NONE, DuplicatePolicy.OVERWRITE]:
-            logger.warning(
-                f"AzureAISearchDocumentStore only supports `DuplicatePolicy.OVERWRITE`"
-                f"but got {policy}. Overwriting duplicates is enabled by default."
-            )
-        client = self.client
+        # Makes sure the index exists and its fields are known before mapping the documents to them
+        _ = self.client
         documents_to_write = [(_convert_input_document(doc)) for doc in documents]
 
+        if policy in [DuplicatePolicy.SKIP, DuplicatePolicy.FAIL] and documents_to_write:
+            # A single lookup per batch of ids finds the documents already in the index
+            existing_ids = set(self._search_documents_by_id([doc["id"] for doc in documents_to_write], select=["id"]))
+            if existing_ids and policy == DuplicatePolicy.FAIL:
+                msg = f"IDs {sorted(existing_ids)} already exist in the index '{self._index_name}'."
+                raise DuplicateDocumentError(msg)
+            documents_to_write = [doc for doc in documents_to_write if doc["id"] not in existing_ids]
+
         if documents_to_write != []:
-            client.upload_documents(documents_to_write)
+            self._upload_documents(documents_to_write)
         return len(documents_to_write)
 
+    def _upload_documents(self, documents: List[Dict[str, Any]]) -> None:
+        """
+        Uploads the documents to the search index.
+
+        The documents are split into batches that fit the request limits of Azure AI Search.
+        Each batch is sent from a background thread, so that the next batch is prepared while the previous one
+        is being uploaded.
+
+        :param documents: documents to upload, already mapped to the fields of the index.
+        :raises HttpResponseError: If a batch could not be sent to the index.
+        :raises AzureAISearchDocumentStoreError: If some of the documents were rejected by the index.
+        """
+        failed_results: List[IndexingResult] = []
+
+        def _send(chunk: List[Dict[str, Any]]) -> None:
+            results = self.write_client.upload_documents(documents=chunk)
+            failed_results.extend(result for result in results if not result.succeeded)
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            pending_upload: Optional[Future] = None
+            for chunk in _chunk_by_size(documents, self._max_upload_batch_size, MAX_UPLOAD_BATCH_BYTES):
+                # The chunk was built while the previous one was uploading
+                if pending_upload is not None:
+                    pending_upload.result()
+                pending_upload = executor.submit(_send, chunk)
+            if pending_upload is not None:
+                pending_upload.result()
+
+        if failed_results:
+            errors = {result.key: result.error_message for result in failed_results}
+            msg = f"Failed to upload {len(failed_results)} documents to the index '{self._index_name}': {errors}"
+            raise AzureAISearchDocumentStoreError(msg)
+
     def delete_documents(self, document_ids: List[str]) -> None:
         """
         Deletes all documents with a matching document_ids from the search index.
 
         :param document_ids: ids of the documents to be deleted.
         """
-        if self.count_documents() == 0:
-            return
-        documents = self._get_raw_documents_by_id(document_ids)
-        if documents:
-            self.client.delete_documents(documents)
+        # Deleting by key needs neither the documents nor a check that they exist:
+        # the service ignores the keys that are not in the index
+        for i in range(0, len(document_ids), self._max_upload_batch_size):
+            batch_ids = document_ids[i : i + self._max_upload_batch_size]
+            self.write_client.delete_documents(documents=[{"id": doc_id} for doc_id in batch_ids])
 
     def get_documents_by_id(self, document_ids: List[str]) -> List[Document]:
         return self._convert_search_result_to_documents(self._get_raw_documents_by_id(document_ids))
@@ -304,14 +516,13 @@ class AzureAISearchDocumentStore:
         :param filters: the filters to apply to the document list.
         :returns: A list of Documents that match the given filters.
         """
-        if filters:
-            normalized_filters = _normalize_filters(filters)
-            result = self.client.search(filter=normalized_filters)
-            return self._convert_search_result_to_documents(result)
-        else:
-            return self.search_documents()
+        normalized_filters = _normalize_filters(filters) if filters else None
+        # No `top` is passed: the results are paged by the service and
+        # the SDK iterator fetches the following pages while they are consumed
+        result = self.client.search(search_text="*", filter=normalized_filters)
+        return self._convert_search_result_to_documents(result)
 
-    def _convert_search_result_to_documents(self, azure_docs: List[Dict[str, Any]]) -> List[Document]:
+    def _convert_search_result_to_documents(self, azure_docs: Iterable[Dict[str, Any]]) -> List[Document]:
         """
         Converts Azure search results to Haystack Documents.
         """
@@ -319,14 +530,17 @@ class AzureAISearchDocumentStore:
 
         for azure_doc in azure_docs:
             embedding = azure_doc.get("embedding")
-            if embedding == self._dummy_vector:
+            if "has_embedding" in azure_doc:
+                embedding = embedding if azure_doc["has_embedding"] else None
+            elif embedding == self._dummy_vector:
+                # Indexes created without the `has_embedding` field store a dummy vector for missing embeddings
                 embedding = None
 
-            # Anything besides default fields (id, content, and embedding) is considered metadata
+            # Anything besides default fields (id, content, embedding and has_embedding) is considered metadata
             meta = {
                 key: value
                 for key, value in azure_doc.items()
-                if key not in ["id", "content", "embedding"] and key in self._index_fields and value is not None
+                if key not in DEFAULT_FIELD_NAMES and key in self._index_fields and value is not None
             }
 
             # Create the document with meta only if it's non-empty
@@ -337,20 +551,6 @@ class AzureAISearchDocumentStore:
             documents.append(doc)
         return documents
 
-    def _index_exists(self, index_name: Optional[str]) -> bool:
-        """
-        Check if the index exists in the Azure AI Search service.
-
-        :param index_name: The name of the index to check.
-        :returns bool: whether the index exists.
-        """
-
-        if self._index_client and index_name:
-            return index_name in self._index_client.list_index_names()
-        else:
-            msg = "Index name is required to check if the index exists."
-            raise ValueError(msg)
-
     def _get_raw_documents_by_id(self, document_ids: List[str]):
         """
         Retrieves all Azure documents with a matching document_ids from the document store.
@@ -358,21 +558,66 @@ class AzureAISearchDocumentStore:
         :param document_ids: ids of the documents to be retrieved.
         :returns: list of retrieved Azure documents.
         """
+        found_documents = self._search_documents_by_id(document_ids)
+
         azure_documents = []
         for doc_id in document_ids:
-            try:
-                document = self.client.get_document(doc_id)
-                azure_documents.append(document)
-            except ResourceNotFoundError:
+            if doc_id in found_documents:
+                azure_documents.append(found_documents[doc_id])
+            else:
                 logger.warning(f"Document with ID {doc_id} not found.")
         return azure_documents
 
-    def _convert_haystack_documents_to_azure(self, document: Dict[str, Any]) -> Dict[str, Any]:
-        """Map the document keys to fields of search index"""
+    def _search_documents_by_id(
+        self, document_ids: List[str], select: Optional[List[str]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Searches the Azure documents with a matching document_ids.
+
+        :param document_ids: ids of the documents to be searched.
+        :param select: fields of the documents to retrieve. If None, all the fields are retrieved.
+        :returns: the found Azure documents, keyed by id.
+        """
+        client = self.client
 
-        # Because Azure Search does not allow dynamic fields, we only include fields that are part of the schema
-        index_document = {k: v for k, v in {**document, **document.get("meta", {})}.items() if k in self._index_fields}
-        if index_document["embedding"] is None:
+        def _search_batch(batch_ids: List[str]) -> List[Dict[str, Any]]:
+            return list(
+                client.search(search_text="*", filter=_build_id_filter(batch_ids), select=select, top=len(batch_ids))
+            )
+
+        # Look up the ids in batches with a single `search.in` filter each,
+        # instead of issuing one `get_document` request per id
+        batches = [
+            document_ids[i : i + MAX_ID_LOOKUP_BATCH_SIZE]
+            for i in range(0, len(document_ids), MAX_ID_LOOKUP_BATCH_SIZE)
+        ]
+        if len(batches) > 1:
+            # Lookups are network-bound, so the batches are sent concurrently
+            with ThreadPoolExecutor(max_workers=min(MAX_ID_LOOKUP_WORKERS, len(batches))) as executor:
+                results = list(executor.map(_search_batch, batches))
+        else:
+            results = [_search_batch(batch_ids) for batch_ids in batches]
+
+        return {document["id"]: document for result in results for document in result}
+
+    def _convert_haystack_documents_to_azure(self, document: Document) -> Dict[str, Any]:
+        """Map the document attributes to fields of search index"""
+
+        # Only the attributes stored in the index are read, instead of deep-copying the whole document
+        embedding = document.embedding
+        if embedding is not None and self._normalize_embeddings:
+            embedding = _normalize_vector(embedding)
+        index_document = {"id": document.id, "content": document.content, "embedding": embedding}
+        # Because Azure Search does not allow dynamic fields, we only include metadata that are part of the schema
+        for key, value in document.meta.items():
+            if key in self._index_fields:
+                index_document[key] = value
+
+        if "has_embedding" in self._index_fields:
+            # The vector is left empty: the flag tells whether the document has an embedding
+            index_document["has_embedding"] = document.embedding is not None
+        elif document.embedding is None:
+            # Indexes created without the `has_embedding` field need a dummy vector instead
             index_document["embedding"] = self._dummy_vector
 
         return index_document
@@ -403,7 +648,7 @@ class AzureAISearchDocumentStore:
                 logger.warning(msg)
                 continue
 
-            field_type = type_mapping.get(value_type)
+            field_type = _get_azure_field_type(value_type)
             if not field_type:
                 error_message = f"Unsupported field type for key '{key}': {value_type}"
                 raise ValueError(error_message)
@@ -442,6 +687,8 @@ class AzureAISearchDocumentStore:
             msg = "query_embedding must be a non-empty list of floats"
             raise ValueError(msg)
 
+        if self._normalize_embeddings:
+            query_embedding = _normalize_vector(query_embedding)
         vector_query = VectorizedQuery(vector=query_embedding, k_nearest_neighbors=top_k, fields="embedding")
         result = self.client.search(vector_queries=[vector_query], filter=filters, **kwargs)
         azure_docs = list(result)
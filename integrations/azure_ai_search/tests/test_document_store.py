@@ -4,11 +4,15 @@
 import os
 import random
 from datetime import datetime, timezone
-from typing import List
-from unittest.mock import patch
+from typing import Dict, List
+from unittest.mock import MagicMock, PropertyMock, call, patch
 
 import pytest
+from azure.core.exceptions import HttpResponseError, ResourceNotFoundError
+from azure.search.documents.indexes.models import VectorSearchAlgorithmMetric
 from haystack.dataclasses.document import Document
+from haystack.document_stores.errors import DuplicateDocumentError
+from haystack.document_stores.types import DuplicatePolicy
 from haystack.errors import FilterError
 from haystack.testing.document_store import (
     CountDocumentsTest,
@@ -19,6 +23,12 @@ from haystack.testing.document_store import (
 from haystack.utils.auth import EnvVarSecret, Secret
 
 from haystack_integrations.document_stores.azure_ai_search import DEFAULT_VECTOR_SEARCH, AzureAISearchDocumentStore
+from haystack_integrations.document_stores.azure_ai_search.document_store import (
+    RETRY_POLICY_KWARGS,
+    _build_id_filter,
+    _chunk_by_size,
+)
+from haystack_integrations.document_stores.azure_ai_search.errors import AzureAISearchDocumentStoreError
 
 
 @patch("haystack_integrations.document_stores.azure_ai_search.document_store.AzureAISearchDocumentStore")
@@ -47,6 +57,9 @@ def test_to_dict(monkeypatch):
                     }
                 ],
             },
+            "max_upload_batch_size": 32000,
+            "embedding_dtype": "single",
+            "normalize_embeddings": False,
         },
     }
 
@@ -99,6 +112,318 @@ def test_init(_mock_azure_search_client):
     assert document_store._vector_search_configuration == DEFAULT_VECTOR_SEARCH
 
 
+@patch("haystack_integrations.document_stores.azure_ai_search.document_store.SearchIndexClient")
+def test_client_is_cached(mock_index_client_class):
+    mock_index_client = mock_index_client_class.return_value
+    document_store = AzureAISearchDocumentStore(
+        api_key=Secret.from_token("fake-api-key"),
+        azure_endpoint=Secret.from_token("fake_endpoint"),
+        index_name="my_index",
+    )
+
+    assert document_store.client is document_store.client
+
+    mock_index_client_class.assert_called_once()
+    assert mock_index_client_class.call_args.kwargs == RETRY_POLICY_KWARGS
+    mock_index_client.list_index_names.assert_not_called()
+    mock_index_client.get_index.assert_called_once_with("my_index")
+    mock_index_client.create_index.assert_not_called()
+    assert document_store.write_client is document_store.write_client
+    assert mock_index_client.get_search_client.call_args_list == [
+        call("my_index"),
+        call("my_index", **RETRY_POLICY_KWARGS),
+    ]
+
+
+def test_init_invalid_embedding_dtype():
+    with pytest.raises(ValueError, match="embedding_dtype must be one of"):
+        AzureAISearchDocumentStore(azure_endpoint=Secret.from_token("fake_endpoint"), embedding_dtype="double")
+
+
+@patch("haystack_integrations.document_stores.azure_ai_search.document_store.SearchIndexClient")
+def test_create_index_with_half_embeddings(mock_index_client_class):
+    mock_index_client = mock_index_client_class.return_value
+    mock_index_client.get_index.side_effect = ResourceNotFoundError("not found")
+    document_store = AzureAISearchDocumentStore(
+        api_key=Secret.from_token("fake-api-key"),
+        azure_endpoint=Secret.from_token("fake_endpoint"),
+        embedding_dtype="half",
+    )
+
+    _ = document_store.client
+
+    mock_index_client.get_index.assert_called_once()
+    index = mock_index_client.create_index.call_args[0][0]
+    embedding_field = next(field for field in index.fields if field.name == "embedding")
+    assert embedding_field.type == "Collection(Edm.Half)"
+
+
+def test_create_index_does_not_extend_default_fields():
+    document_store = AzureAISearchDocumentStore(
+        azure_endpoint=Secret.from_token("fake_endpoint"), metadata_fields={"author": str}
+    )
+
+    first_index = document_store._create_index("first")
+    second_index = document_store._create_index("second")
+
+    default_field_names = ["id", "content", "embedding", "has_embedding"]
+    assert [field.name for field in document_store._build_default_fields()] == default_field_names
+    assert [field.name for field in first_index.fields] == [*default_field_names, "author"]
+    assert [field.name for field in second_index.fields] == [*default_field_names, "author"]
+
+
+def test_map_metadata_field_types():
+    document_store = AzureAISearchDocumentStore(azure_endpoint=Secret.from_token("fake_endpoint"))
+
+    mapping = document_store._map_metadata_field_types(
+        {"author": str, "date": datetime, "tags": List[str], "pages": List[int], "_hidden": str}
+    )
+
+    assert mapping == {
+        "author": "Edm.String",
+        "date": "Edm.DateTimeOffset",
+        "tags": "Collection(Edm.String)",
+        "pages": "Collection(Edm.Int32)",
+    }
+
+
+@pytest.mark.parametrize("value_type", [bytes, List[bytes], Dict[str, str]])
+def test_map_metadata_field_types_unsupported(value_type):
+    document_store = AzureAISearchDocumentStore(azure_endpoint=Secret.from_token("fake_endpoint"))
+
+    with pytest.raises(ValueError, match="Unsupported field type for key 'field'"):
+        document_store._map_metadata_field_types({"field": value_type})
+
+
+def test_get_raw_documents_by_id_batches_lookups():
+    document_store = AzureAISearchDocumentStore(azure_endpoint=Secret.from_token("fake_endpoint"))
+    mock_client = MagicMock()
+    mock_client.search.return_value = [{"id": "2", "content": "b"}, {"id": "1", "content": "a"}]
+
+    with patch.object(AzureAISearchDocumentStore, "client", new_callable=PropertyMock, return_value=mock_client):
+        documents = document_store._get_raw_documents_by_id(["1", "2", "3"])
+
+    mock_client.search.assert_called_once_with(
+        search_text="*", filter="search.in(id, '1,2,3', ',')", select=None, top=3
+    )
+    mock_client.get_document.assert_not_called()
+    assert [doc["id"] for doc in documents] == ["1", "2"]
+
+
+def test_get_raw_documents_by_id_runs_batches_concurrently():
+    document_store = AzureAISearchDocumentStore(azure_endpoint=Secret.from_token("fake_endpoint"))
+    mock_client = MagicMock()
+    mock_client.search.side_effect = lambda **kwargs: [{"id": "0"}] if "'0," in kwargs["filter"] else []
+    document_ids = [str(i) for i in range(2500)]
+
+    with patch.object(AzureAISearchDocumentStore, "client", new_callable=PropertyMock, return_value=mock_client):
+        documents = document_store._get_raw_documents_by_id(document_ids)
+
+    assert mock_client.search.call_count == 3
+    assert [call.kwargs["top"] for call in mock_client.search.call_args_list] == [1000, 1000, 500]
+    assert documents == [{"id": "0"}]
+
+
+def test_filter_documents_without_filters_returns_all_documents():
+    document_store = AzureAISearchDocumentStore(azure_endpoint=Secret.from_token("fake_endpoint"))
+    document_store._index_fields = {"id", "content", "embedding"}
+    mock_client = MagicMock()
+    mock_client.search.return_value = iter([{"id": str(i), "content": f"doc {i}"} for i in range(25)])
+
+    with patch.object(AzureAISearchDocumentStore, "client", new_callable=PropertyMock, return_value=mock_client):
+        documents = document_store.filter_documents()
+
+    mock_client.search.assert_called_once_with(search_text="*", filter=None)
+    assert len(documents) == 25
+
+
+def _upload_results(documents, *, succeeded=True):
+    return [MagicMock(key=document["id"], succeeded=succeeded, error_message="error") for document in documents]
+
+
+def test_write_documents_uploads_chunks_in_order():
+    document_store = AzureAISearchDocumentStore(
+        api_key=Secret.from_token("fake-api-key"),
+        azure_endpoint=Secret.from_token("fake_endpoint"),
+        max_upload_batch_size=2,
+    )
+    document_store._index_fields = {"id", "content", "embedding"}
+    mock_client = MagicMock()
+    mock_client.upload_documents.side_effect = _upload_results
+    document_store._write_client = mock_client
+
+    with patch.object(AzureAISearchDocumentStore, "client", new_callable=PropertyMock, return_value=mock_client):
+        written = document_store.write_documents([Document(id=str(i), content="a") for i in range(5)])
+
+    assert written == 5
+    uploaded = [
+        [doc["id"] for doc in upload_call.kwargs["documents"]]
+        for upload_call in mock_client.upload_documents.call_args_list
+    ]
+    assert uploaded == [["0", "1"], ["2", "3"], ["4"]]
+
+
+def test_write_documents_raises_on_failed_documents():
+    document_store = AzureAISearchDocumentStore(
+        api_key=Secret.from_token("fake-api-key"), azure_endpoint=Secret.from_token("fake_endpoint")
+    )
+    document_store._index_fields = {"id", "content", "embedding"}
+    mock_client = MagicMock()
+    mock_client.upload_documents.side_effect = lambda documents: _upload_results(documents, succeeded=False)
+    document_store._write_client = mock_client
+
+    with patch.object(AzureAISearchDocumentStore, "client", new_callable=PropertyMock, return_value=mock_client):
+        with pytest.raises(AzureAISearchDocumentStoreError, match="Failed to upload 1 documents"):
+            document_store.write_documents([Document(id="1", content="a")])
+
+
+def test_write_documents_propagates_http_errors():
+    document_store = AzureAISearchDocumentStore(
+        api_key=Secret.from_token("fake-api-key"),
+        azure_endpoint=Secret.from_token("fake_endpoint"),
+        max_upload_batch_size=2,
+    )
+    document_store._index_fields = {"id", "content", "embedding"}
+    mock_client = MagicMock()
+    mock_client.upload_documents.side_effect = HttpResponseError(message="Service Unavailable")
+    document_store._write_client = mock_client
+
+    with patch.object(AzureAISearchDocumentStore, "client", new_callable=PropertyMock, return_value=mock_client):
+        with pytest.raises(HttpResponseError, match="Service Unavailable"):
+            document_store.write_documents([Document(id=str(i), content="a") for i in range(5)])
+
+
+def test_convert_haystack_documents_to_azure():
+    document_store = AzureAISearchDocumentStore(
+        azure_endpoint=Secret.from_token("fake_endpoint"), embedding_dimension=3
+    )
+    document_store._index_fields = {"id", "content", "embedding", "author"}
+
+    index_document = document_store._convert_haystack_documents_to_azure(
+        Document(id="1", content="a", meta={"author": "Tom", "not_in_index": 1})
+    )
+
+    assert index_document == {"id": "1", "content": "a", "embedding": [-10.0, -10.0, -10.0], "author": "Tom"}
+
+
+@pytest.mark.parametrize("policy", [DuplicatePolicy.SKIP, DuplicatePolicy.FAIL])
+def test_write_documents_duplicate_policies(policy):
+    document_store = AzureAISearchDocumentStore(
+        api_key=Secret.from_token("fake-api-key"), azure_endpoint=Secret.from_token("fake_endpoint")
+    )
+    document_store._index_fields = {"id", "content", "embedding"}
+    mock_client = MagicMock()
+    mock_client.search.return_value = [{"id": "1"}]
+    mock_client.upload_documents.side_effect = _upload_results
+    document_store._write_client = mock_client
+    documents = [Document(id="1", content="a"), Document(id="2", content="b")]
+
+    with patch.object(AzureAISearchDocumentStore, "client", new_callable=PropertyMock, return_value=mock_client):
+        if policy == DuplicatePolicy.FAIL:
+            with pytest.raises(DuplicateDocumentError):
+                document_store.write_documents(documents, policy=policy)
+            mock_client.upload_documents.assert_not_called()
+        else:
+            assert document_store.write_documents(documents, policy=policy) == 1
+            assert [doc["id"] for doc in mock_client.upload_documents.call_args.kwargs["documents"]] == ["2"]
+
+    mock_client.search.assert_called_once_with(
+        search_text="*", filter="search.in(id, '1,2', ',')", select=["id"], top=2
+    )
+
+
+def test_convert_haystack_documents_to_azure_with_has_embedding_field():
+    document_store = AzureAISearchDocumentStore(
+        azure_endpoint=Secret.from_token("fake_endpoint"), embedding_dimension=3
+    )
+    document_store._index_fields = {"id", "content", "embedding", "has_embedding"}
+
+    without_embedding = document_store._convert_haystack_documents_to_azure(Document(id="1", content="a"))
+    with_embedding = document_store._convert_haystack_documents_to_azure(
+        Document(id="2", content="b", embedding=[0.1, 0.2, 0.3])
+    )
+
+    assert without_embedding == {"id": "1", "content": "a", "embedding": None, "has_embedding": False}
+    assert with_embedding == {"id": "2", "content": "b", "embedding": [0.1, 0.2, 0.3], "has_embedding": True}
+
+
+def test_normalize_embeddings():
+    document_store = AzureAISearchDocumentStore(
+        api_key=Secret.from_token("fake-api-key"),
+        azure_endpoint=Secret.from_token("fake_endpoint"),
+        embedding_dimension=2,
+        normalize_embeddings=True,
+    )
+    document_store._index_fields = {"id", "content", "embedding", "has_embedding"}
+    metric = document_store._vector_search_configuration.algorithms[0].parameters.metric
+    assert metric == VectorSearchAlgorithmMetric.DOT_PRODUCT
+
+    index_document = document_store._convert_haystack_documents_to_azure(
+        Document(id="1", content="a", embedding=[3.0, 4.0])
+    )
+    assert index_document["embedding"] == [0.6, 0.8]
+
+    mock_client = MagicMock()
+    mock_client.search.return_value = []
+    with patch.object(AzureAISearchDocumentStore, "client", new_callable=PropertyMock, return_value=mock_client):
+        document_store._embedding_retrieval(query_embedding=[0.0, 2.0])
+    vector_query = mock_client.search.call_args.kwargs["vector_queries"][0]
+    assert vector_query.vector == [0.0, 1.0]
+
+
+def test_convert_search_result_to_documents():
+    document_store = AzureAISearchDocumentStore(
+        azure_endpoint=Secret.from_token("fake_endpoint"), embedding_dimension=3
+    )
+    document_store._index_fields = {"id", "content", "embedding", "has_embedding", "author"}
+
+    documents = document_store._convert_search_result_to_documents(
+        [
+            {"id": "1", "content": "a", "embedding": None, "has_embedding": False, "author": "Tom"},
+            {"id": "2", "content": "b", "embedding": [0.1, 0.2, 0.3], "has_embedding": True, "author": None},
+            # written to an index without the `has_embedding` field
+            {"id": "3", "content": "c", "embedding": [-10.0, -10.0, -10.0], "@search.score": 1.0},
+        ]
+    )
+
+    assert documents == [
+        Document(id="1", content="a", meta={"author": "Tom"}),
+        Document(id="2", content="b", embedding=[0.1, 0.2, 0.3]),
+        Document(id="3", content="c"),
+    ]
+
+
+def test_delete_documents_by_key():
+    document_store = AzureAISearchDocumentStore(
+        azure_endpoint=Secret.from_token("fake_endpoint"), max_upload_batch_size=2
+    )
+    mock_client = MagicMock()
+    document_store._write_client = mock_client
+
+    document_store.delete_documents(["1", "2", "3"])
+
+    mock_client.search.assert_not_called()
+    mock_client.get_document_count.assert_not_called()
+    assert [delete_call.kwargs["documents"] for delete_call in mock_client.delete_documents.call_args_list] == [
+        [{"id": "1"}, {"id": "2"}],
+        [{"id": "3"}],
+    ]
+
+
+def test_chunk_by_size():
+    documents = [{"id": str(i), "content": "x" * 100} for i in range(5)]
+
+    assert [len(chunk) for chunk in _chunk_by_size(documents, max_docs=2, max_bytes=10_000)] == [2, 2, 1]
+    assert [len(chunk) for chunk in _chunk_by_size(documents, max_docs=10, max_bytes=300)] == [2, 2, 1]
+    # a document larger than the byte limit is sent on its own
+    assert [len(chunk) for chunk in _chunk_by_size(documents, max_docs=10, max_bytes=10)] == [1, 1, 1, 1, 1]
+
+
+def test_build_id_filter():
+    assert _build_id_filter(["a", "b'c"]) == "search.in(id, 'a,b''c', ',')"
+    assert _build_id_filter(["a", "b,c"]) == "id eq 'a' or id eq 'b,c'"
+
+
 @pytest.mark.skipif(
     not os.environ.get("AZURE_SEARCH_SERVICE_ENDPOINT", None) and not os.environ.get("AZURE_SEARCH_API_KEY", None),
     reason="Missing AZURE_SEARCH_SERVICE_ENDPOINT or AZURE_SEARCH_API_KEY.",
@@ -129,12 +454,6 @@ class TestDocumentStore(CountDocumentsTest, WriteDocumentsTest, DeleteDocumentsT
         doc = document_store.get_documents_by_id(["1"])
         assert doc[0] == docs[0]
 
-    @pytest.mark.skip(reason="Azure AI search index overwrites duplicate documents by default")
-    def test_write_documents_duplicate_fail(self, document_store: AzureAISearchDocumentStore): ...
-
-    @pytest.mark.skip(reason="Azure AI search index overwrites duplicate documents by default")
-    def test_write_documents_duplicate_skip(self, document_store: AzureAISearchDocumentStore): ...
-
 
 def _random_embeddings(n):
     return [round(random.random(), 7) for _ in range(n)]  # nosec: S311
@@ -63,6 +63,9 @@ def test_to_dict():
                             }
                         ],
                     },
+                    "max_upload_batch_size": 32000,
+                    "embedding_dtype": "single",
+                    "normalize_embeddings": False,
                     "hosts": "some fake host",
                 },
             },
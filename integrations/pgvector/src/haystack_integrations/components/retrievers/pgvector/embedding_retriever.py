@@ -88,7 +88,7 @@ class PgvectorEmbeddingRetriever:
             raise ValueError(msg)
 
         if vector_function and vector_function not in VALID_VECTOR_FUNCTIONS:
-            msg = f"vector_function must be one of {VALID_VECTOR_FUNCTIONS}"
+            msg = f"vector_function must be one of {sorted(VALID_VECTOR_FUNCTIONS)}"
             raise ValueError(msg)
 
         self.document_store = document_store
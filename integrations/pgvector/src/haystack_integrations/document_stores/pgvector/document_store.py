@@ -1,28 +1,74 @@
 # SPDX-FileCopyrightText: 2023-present deepset GmbH <info@deepset.ai>
 #
 # SPDX-License-Identifier: Apache-2.0
+import io
+import json
 import logging
-from typing import Any, Dict, List, Literal, Optional
+import math
+from typing import Any, Dict, Iterator, List, Literal, Optional, Tuple
 
+import numpy as np
 from haystack import default_from_dict, default_to_dict
 from haystack.dataclasses.document import ByteStream, Document
 from haystack.document_stores.errors import DocumentStoreError, DuplicateDocumentError
 from haystack.document_stores.types import DuplicatePolicy
 from haystack.utils.auth import Secret, deserialize_secrets_inplace
+from pandas import read_json
 from psycopg import Error, IntegrityError, connect
 from psycopg.abc import Query
 from psycopg.cursor import Cursor
-from psycopg.rows import dict_row
-from psycopg.sql import SQL, Identifier
+from psycopg.errors import UndefinedColumn
+from psycopg.rows import dict_row, tuple_row
+from psycopg.sql import SQL, Composed, Identifier
 from psycopg.sql import Literal as SQLLiteral
-from psycopg.types.json import Jsonb
+from psycopg.types.json import Jsonb, set_json_dumps
 
 from pgvector.psycopg import register_vector
 
 from .filters import _convert_filters_to_where_clause_and_params
 
+try:
+    import orjson
+
+    _HAS_ORJSON = True
+except ImportError:  # orjson is optional: the standard json module is used if it is not installed
+    _HAS_ORJSON = False
+
 logger = logging.getLogger(__name__)
 
+
+def _is_plain_json(obj: Any) -> bool:
+    """
+    Checks if the value only contains the JSON types, with string keys and finite floats.
+    orjson serializes these values as the standard json module does, while it writes NaN and infinity as `null`
+    and serializes natively some types, like dates and UUIDs, that the json module rejects.
+    """
+    obj_type = type(obj)
+    if obj is None or obj_type in (str, int, bool):
+        return True
+    if obj_type is float:
+        return math.isfinite(obj)
+    if obj_type is dict:
+        return all(type(key) is str and _is_plain_json(value) for key, value in obj.items())
+    if obj_type in (list, tuple):
+        return all(_is_plain_json(value) for value in obj)
+    return False
+
+
+def _orjson_dumps(obj: Any) -> Any:
+    """
+    Serializes the JSONB values with orjson, which is several times faster than the standard json module.
+    The values that orjson would serialize differently, or refuses (like integers over 64 bits),
+    are serialized with the json module.
+    """
+    if _is_plain_json(obj):
+        try:
+            return orjson.dumps(obj)
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(obj)
+
+
 CREATE_TABLE_STATEMENT = """
 CREATE TABLE IF NOT EXISTS {schema_name}.{table_name} (
 id VARCHAR(128) PRIMARY KEY,
@@ -32,9 +78,21 @@ dataframe JSONB,
 blob_data BYTEA,
 blob_meta JSONB,
 blob_mime_type VARCHAR(255),
-meta JSONB)
+meta JSONB,
+content_tsv TSVECTOR GENERATED ALWAYS AS (to_tsvector({language}, content)) STORED)
+"""
+
+# Tables created by older versions don't have the generated `content_tsv` column.
+# It is only added if `add_content_tsv_column` is set, as this rewrites the whole table.
+ADD_CONTENT_TSV_COLUMN_STATEMENT = """
+ALTER TABLE {schema_name}.{table_name}
+ADD COLUMN IF NOT EXISTS content_tsv TSVECTOR GENERATED ALWAYS AS (to_tsvector({language}, content)) STORED
 """
 
+# The columns holding the Documents, which are returned by the queries.
+# `content_tsv` is not one of them, as it is only used for keyword retrieval.
+DOCUMENT_COLUMNS = ["id", "embedding", "content", "dataframe", "blob_data", "blob_meta", "blob_mime_type", "meta"]
+
 INSERT_STATEMENT = """
 INSERT INTO {schema_name}.{table_name}
 (id, embedding, content, dataframe, blob_data, blob_meta, blob_mime_type, meta)
@@ -52,13 +110,41 @@ blob_mime_type = EXCLUDED.blob_mime_type,
 meta = EXCLUDED.meta
 """
 
+# Maximum number of ids deleted by a single DELETE statement
+DELETE_BATCH_SIZE = 10_000
+
+# Batches of at least this many documents are written with COPY into a temporary staging table,
+# and then moved to the documents table with a single INSERT ... SELECT.
+# Smaller batches are written with a parameterized INSERT per document.
+COPY_WRITE_THRESHOLD = 1024
+
+COPY_COLUMNS = DOCUMENT_COLUMNS
+COPY_COLUMN_TYPES = ["varchar", "vector", "text", "jsonb", "bytea", "jsonb", "varchar", "jsonb"]
+
+CREATE_STAGING_TABLE_STATEMENT = """
+CREATE TEMPORARY TABLE {staging_table_name}
+(LIKE {schema_name}.{table_name} INCLUDING DEFAULTS) ON COMMIT DROP
+"""
+
+COPY_STATEMENT = """
+COPY {staging_table_name}
+(id, embedding, content, dataframe, blob_data, blob_meta, blob_mime_type, meta)
+FROM STDIN WITH (FORMAT BINARY)
+"""
+
+INSERT_FROM_STAGING_STATEMENT = """
+INSERT INTO {schema_name}.{table_name}
+(id, embedding, content, dataframe, blob_data, blob_meta, blob_mime_type, meta)
+SELECT id, embedding, content, dataframe, blob_data, blob_meta, blob_mime_type, meta FROM {staging_table_name}
+"""
+
 KEYWORD_QUERY = """
-SELECT {table_name}.*, ts_rank_cd(to_tsvector({language}, content), query) AS score
+SELECT {columns}, ts_rank_cd({content_tsv}, query) AS score
 FROM {schema_name}.{table_name}, plainto_tsquery({language}, %s) query
-WHERE to_tsvector({language}, content) @@ query
+WHERE {content_tsv} @@ query
 """
 
-VALID_VECTOR_FUNCTIONS = ["cosine_similarity", "inner_product", "l2_distance"]
+VALID_VECTOR_FUNCTIONS = frozenset(["cosine_similarity", "inner_product", "l2_distance"])
 
 VECTOR_FUNCTION_TO_POSTGRESQL_OPS = {
     "cosine_similarity": "vector_cosine_ops",
@@ -66,7 +152,27 @@ VECTOR_FUNCTION_TO_POSTGRESQL_OPS = {
     "l2_distance": "vector_l2_ops",
 }
 
+VECTOR_FUNCTION_TO_POSTGRESQL_OPERATOR = {
+    "cosine_similarity": "<=>",
+    "inner_product": "<#>",
+    "l2_distance": "<->",
+}
+
+# to compute the scores, we use the approach described in pgvector README:
+# https://github.com/pgvector/pgvector?tab=readme-ov-file#distances
+# cosine_similarity and inner_product are modified from the result of the operator
+VECTOR_FUNCTION_TO_SCORE_SQL = {
+    "cosine_similarity": "1 - (embedding <=> %s) AS score",
+    "inner_product": "(embedding <#> %s) * -1 AS score",
+    "l2_distance": "embedding <-> %s AS score",
+}
+
 HNSW_INDEX_CREATION_VALID_KWARGS = ["m", "ef_construction"]
+# pgvector builds the index with m=16 and ef_construction=64 if they are not set:
+# a larger ef_construction gives a better recall for a slightly slower build
+HNSW_INDEX_CREATION_DEFAULT_KWARGS = {"m": 16, "ef_construction": 128}
+
+IVFFLAT_INDEX_CREATION_VALID_KWARGS = ["lists"]
 
 
 class PgvectorDocumentStore:
@@ -84,12 +190,19 @@ class PgvectorDocumentStore:
         embedding_dimension: int = 768,
         vector_function: Literal["cosine_similarity", "inner_product", "l2_distance"] = "cosine_similarity",
         recreate_table: bool = False,
-        search_strategy: Literal["exact_nearest_neighbor", "hnsw"] = "exact_nearest_neighbor",
+        search_strategy: Literal["exact_nearest_neighbor", "hnsw", "ivfflat"] = "exact_nearest_neighbor",
         hnsw_recreate_index_if_exists: bool = False,
         hnsw_index_creation_kwargs: Optional[Dict[str, int]] = None,
         hnsw_index_name: str = "haystack_hnsw_index",
         hnsw_ef_search: Optional[int] = None,
+        hnsw_parallel_workers: Optional[int] = None,
+        hnsw_maintenance_work_mem: Optional[str] = None,
+        ivfflat_recreate_index_if_exists: bool = False,
+        ivfflat_index_creation_kwargs: Optional[Dict[str, int]] = None,
+        ivfflat_index_name: str = "haystack_ivfflat_index",
+        ivfflat_probes: Optional[int] = None,
         keyword_index_name: str = "haystack_keyword_index",
+        add_content_tsv_column: bool = False,
     ):
         """
         Creates a new PgvectorDocumentStore instance.
@@ -105,6 +218,9 @@ class PgvectorDocumentStore:
         :param schema_name: The name of the schema the table is created in. The schema must already exist.
         :param table_name: The name of the table to use to store Haystack documents.
         :param language: The language to be used to parse query and document content in keyword retrieval.
+            The content of the documents is parsed when they are written, into a `content_tsv` column generated
+            with the language of the Document Store that created the table. In tables created by older versions
+            without this column, the content is parsed at query time.
             To see the list of available languages, you can run the following SQL query in your PostgreSQL database:
             `SELECT cfgname FROM pg_ts_config;`.
             More information can be found in this [StackOverflow answer](https://stackoverflow.com/a/39752553).
@@ -114,27 +230,51 @@ class PgvectorDocumentStore:
             higher scores indicate greater similarity between the documents.
             `"l2_distance"` returns the straight-line distance between vectors,
             and the most similar documents are the ones with the smallest score.
-            **Important**: when using the `"hnsw"` search strategy, an index will be created that depends on the
-            `vector_function` passed here. Make sure subsequent queries will keep using the same
+            **Important**: when using the `"hnsw"` or `"ivfflat"` search strategy, an index will be created that
+            depends on the `vector_function` passed here. Make sure subsequent queries will keep using the same
             vector similarity function in order to take advantage of the index.
         :param recreate_table: Whether to recreate the table if it already exists.
         :param search_strategy: The search strategy to use when searching for similar embeddings.
             `"exact_nearest_neighbor"` provides perfect recall but can be slow for large numbers of documents.
             `"hnsw"` is an approximate nearest neighbor search strategy,
             which trades off some accuracy for speed; it is recommended for large numbers of documents.
-            **Important**: when using the `"hnsw"` search strategy, an index will be created that depends on the
-            `vector_function` passed here. Make sure subsequent queries will keep using the same
+            `"ivfflat"` is an approximate nearest neighbor search strategy with a smaller index, which is faster to
+            build than the HNSW one, but has a worse speed-recall tradeoff. The index is built from the
+            documents in the table when it is created: create it once the table contains data.
+            **Important**: when using the `"hnsw"` or `"ivfflat"` search strategy, an index will be created that
+            depends on the `vector_function` passed here. Make sure subsequent queries will keep using the same
             vector similarity function in order to take advantage of the index.
         :param hnsw_recreate_index_if_exists: Whether to recreate the HNSW index if it already exists.
             Only used if search_strategy is set to `"hnsw"`.
         :param hnsw_index_creation_kwargs: Additional keyword arguments to pass to the HNSW index creation.
             Only used if search_strategy is set to `"hnsw"`. You can find the list of valid arguments in the
-            [pgvector documentation](https://github.com/pgvector/pgvector?tab=readme-ov-file#hnsw)
+            [pgvector documentation](https://github.com/pgvector/pgvector?tab=readme-ov-file#hnsw).
+            Defaults to `{"m": 16, "ef_construction": 128}`. `ef_construction` must be at least twice `m`.
         :param hnsw_index_name: Index name for the HNSW index.
         :param hnsw_ef_search: The `ef_search` parameter to use at query time. Only used if search_strategy is set to
             `"hnsw"`. You can find more information about this parameter in the
             [pgvector documentation](https://github.com/pgvector/pgvector?tab=readme-ov-file#hnsw).
+        :param hnsw_parallel_workers: The number of parallel maintenance workers used to build the HNSW index
+            (`max_parallel_maintenance_workers`). Only used if search_strategy is set to `"hnsw"`.
+            If not set, the value configured in the PostgreSQL server is used.
+        :param hnsw_maintenance_work_mem: The memory available to build the HNSW index (`maintenance_work_mem`),
+            e.g. `"2GB"`. The build is much faster when the graph fits into it.
+            Only used if search_strategy is set to `"hnsw"`.
+            If not set, the value configured in the PostgreSQL server is used.
+        :param ivfflat_recreate_index_if_exists: Whether to recreate the IVFFlat index if it already exists.
+            Only used if search_strategy is set to `"ivfflat"`. Recreate the index after loading most of the
+            documents, as the lists of the index are computed from the documents in the table.
+        :param ivfflat_index_creation_kwargs: Additional keyword arguments to pass to the IVFFlat index creation.
+            Only used if search_strategy is set to `"ivfflat"`. You can find the list of valid arguments in the
+            [pgvector documentation](https://github.com/pgvector/pgvector?tab=readme-ov-file#ivfflat)
+        :param ivfflat_index_name: Index name for the IVFFlat index.
+        :param ivfflat_probes: The `probes` parameter to use at query time. Only used if search_strategy is set to
+            `"ivfflat"`. You can find more information about this parameter in the
+            [pgvector documentation](https://github.com/pgvector/pgvector?tab=readme-ov-file#ivfflat).
         :param keyword_index_name: Index name for the Keyword index.
+        :param add_content_tsv_column: Whether to add the `content_tsv` column to a table created by an older version
+            without it, and to rebuild the keyword index on it. The table is rewritten while holding an exclusive lock,
+            which blocks reads and writes: this can take a long time on large tables.
         """
 
         self.connection_string = connection_string
@@ -142,20 +282,116 @@ class PgvectorDocumentStore:
         self.schema_name = schema_name
         self.embedding_dimension = embedding_dimension
         if vector_function not in VALID_VECTOR_FUNCTIONS:
-            msg = f"vector_function must be one of {VALID_VECTOR_FUNCTIONS}, but got {vector_function}"
+            msg = f"vector_function must be one of {sorted(VALID_VECTOR_FUNCTIONS)}, but got {vector_function}"
             raise ValueError(msg)
         self.vector_function = vector_function
         self.recreate_table = recreate_table
         self.search_strategy = search_strategy
         self.hnsw_recreate_index_if_exists = hnsw_recreate_index_if_exists
-        self.hnsw_index_creation_kwargs = hnsw_index_creation_kwargs or {}
+        self.hnsw_index_creation_kwargs = hnsw_index_creation_kwargs or dict(HNSW_INDEX_CREATION_DEFAULT_KWARGS)
+        if search_strategy == "hnsw":
+            # pgvector uses m=16 and ef_construction=64 for the missing ones
+            m = self.hnsw_index_creation_kwargs.get("m", 16)
+            ef_construction = self.hnsw_index_creation_kwargs.get("ef_construction", 64)
+            if ef_construction < 2 * m:
+                msg = (
+                    "ef_construction must be greater than or equal to 2 * m in hnsw_index_creation_kwargs, "
+                    f"but got m={m} and ef_construction={ef_construction}"
+                )
+                raise ValueError(msg)
         self.hnsw_index_name = hnsw_index_name
         self.hnsw_ef_search = hnsw_ef_search
+        self.hnsw_parallel_workers = hnsw_parallel_workers
+        self.hnsw_maintenance_work_mem = hnsw_maintenance_work_mem
+        self.ivfflat_recreate_index_if_exists = ivfflat_recreate_index_if_exists
+        self.ivfflat_index_creation_kwargs = ivfflat_index_creation_kwargs or {}
+        self.ivfflat_index_name = ivfflat_index_name
+        self.ivfflat_probes = ivfflat_probes
         self.keyword_index_name = keyword_index_name
+        self.add_content_tsv_column = add_content_tsv_column
         self.language = language
+        # set when connecting, as tables created by older versions don't have the `content_tsv` column
+        self._has_content_tsv_column = True
         self._connection = None
         self._cursor = None
         self._dict_cursor = None
+        self._tuple_cursor = None
+        self._compose_statements()
+
+    def _compose_statements(self):
+        """
+        Internal method to compose the statements used on every call, which only depend on the table and schema.
+        They are composed once here, and the methods using them only append the filters, sorting or conflict handling.
+        """
+
+        schema_name = Identifier(self.schema_name)
+        table_name = Identifier(self.table_name)
+        columns = SQL(", ").join(Identifier(column) for column in DOCUMENT_COLUMNS)
+
+        self._sql_count = SQL("SELECT COUNT(*) FROM {schema_name}.{table_name}").format(
+            schema_name=schema_name, table_name=table_name
+        )
+        # the row count estimate of the planner, which doesn't need to scan the table
+        self._sql_count_estimate = SQL(
+            "SELECT reltuples::bigint FROM pg_class "
+            "JOIN pg_namespace ON pg_namespace.oid = pg_class.relnamespace "
+            "WHERE pg_namespace.nspname = %s AND pg_class.relname = %s"
+        )
+        self._sql_select = SQL("SELECT {columns} FROM {schema_name}.{table_name}").format(
+            columns=columns, schema_name=schema_name, table_name=table_name
+        )
+
+        sql_insert = SQL(INSERT_STATEMENT).format(schema_name=schema_name, table_name=table_name)
+        self._sql_insert = {
+            DuplicatePolicy.FAIL: sql_insert + SQL(" RETURNING id"),
+            DuplicatePolicy.OVERWRITE: sql_insert + SQL(UPDATE_STATEMENT) + SQL(" RETURNING id"),
+            DuplicatePolicy.SKIP: sql_insert + SQL("ON CONFLICT DO NOTHING") + SQL(" RETURNING id"),
+        }
+
+        # statements of the COPY write path
+        staging_table_name = Identifier(f"{self.table_name}_staging")
+        self._sql_create_staging_table = SQL(CREATE_STAGING_TABLE_STATEMENT).format(
+            staging_table_name=staging_table_name, schema_name=schema_name, table_name=table_name
+        )
+        self._sql_copy = SQL(COPY_STATEMENT).format(staging_table_name=staging_table_name)
+        sql_insert_from_staging = SQL(INSERT_FROM_STAGING_STATEMENT).format(
+            schema_name=schema_name, table_name=table_name, staging_table_name=staging_table_name
+        )
+        self._sql_insert_from_staging = {
+            DuplicatePolicy.FAIL: sql_insert_from_staging + SQL(" RETURNING id"),
+            DuplicatePolicy.OVERWRITE: sql_insert_from_staging + SQL(UPDATE_STATEMENT) + SQL(" RETURNING id"),
+            DuplicatePolicy.SKIP: sql_insert_from_staging + SQL("ON CONFLICT DO NOTHING") + SQL(" RETURNING id"),
+        }
+        self._sql_drop_staging_table = SQL("DROP TABLE {staging_table_name}").format(
+            staging_table_name=staging_table_name
+        )
+
+        self._sql_delete = SQL(
+            "DELETE FROM {schema_name}.{table_name} AS documents "
+            "USING unnest(%s::varchar[]) AS ids(id) WHERE documents.id = ids.id"
+        ).format(schema_name=schema_name, table_name=table_name)
+
+        language = SQLLiteral(self.language)
+        self._sql_keyword_select = {
+            has_content_tsv_column: SQL(KEYWORD_QUERY).format(
+                columns=columns,
+                schema_name=schema_name,
+                table_name=table_name,
+                language=language,
+                content_tsv=content_tsv,
+            )
+            for has_content_tsv_column, content_tsv in [
+                (True, SQL("content_tsv")),
+                (False, SQL("to_tsvector({language}, content)").format(language=language)),
+            ]
+        }
+
+        self._sql_embedding_select = {
+            vector_function: SQL("SELECT {columns}, {score} FROM {schema_name}.{table_name}").format(
+                columns=columns, schema_name=schema_name, table_name=table_name, score=SQL(score_sql)
+            )
+            for vector_function, score_sql in VECTOR_FUNCTION_TO_SCORE_SQL.items()
+        }
 
     @property
     def cursor(self):
@@ -171,6 +407,13 @@ class PgvectorDocumentStore:
 
         return self._dict_cursor
 
+    @property
+    def tuple_cursor(self):
+        if self._tuple_cursor is None:
+            self._create_connection()
+
+        return self._tuple_cursor
+
     @property
     def connection(self):
         if self._connection is None:
@@ -184,10 +427,18 @@ class PgvectorDocumentStore:
         connection.autocommit = True
         connection.execute("CREATE EXTENSION IF NOT EXISTS vector")
         register_vector(connection)  # Note: this must be called before creating the cursors.
+        if _HAS_ORJSON:
+            # only the JSON serialization of this connection is changed, not the global psycopg one
+            set_json_dumps(_orjson_dumps, context=connection)
 
         self._connection = connection
         self._cursor = self._connection.cursor()
-        self._dict_cursor = self._connection.cursor(row_factory=dict_row)
+        # the documents are read in binary format: the embeddings are decoded with a single `numpy.frombuffer`
+        # instead of parsing the text representation of every float
+        self._dict_cursor = self._connection.cursor(row_factory=dict_row, binary=True)
+        # the retrieval queries return the columns in the order of `DOCUMENT_COLUMNS` followed by the score,
+        # so their rows are read as tuples, without building a dictionary for each of them
+        self._tuple_cursor = self._connection.cursor(row_factory=tuple_row, binary=True)
 
         # Init schema
         if self.recreate_table:
@@ -197,6 +448,8 @@ class PgvectorDocumentStore:
 
         if self.search_strategy == "hnsw":
             self._handle_hnsw()
+        elif self.search_strategy == "ivfflat":
+            self._handle_ivfflat()
 
         return self._connection
 
@@ -220,7 +473,14 @@ class PgvectorDocumentStore:
             hnsw_index_creation_kwargs=self.hnsw_index_creation_kwargs,
             hnsw_index_name=self.hnsw_index_name,
             hnsw_ef_search=self.hnsw_ef_search,
+            hnsw_parallel_workers=self.hnsw_parallel_workers,
+            hnsw_maintenance_work_mem=self.hnsw_maintenance_work_mem,
+            ivfflat_recreate_index_if_exists=self.ivfflat_recreate_index_if_exists,
+            ivfflat_index_creation_kwargs=self.ivfflat_index_creation_kwargs,
+            ivfflat_index_name=self.ivfflat_index_name,
+            ivfflat_probes=self.ivfflat_probes,
             keyword_index_name=self.keyword_index_name,
+            add_content_tsv_column=self.add_content_tsv_column,
             language=self.language,
         )
 
@@ -238,7 +498,12 @@ class PgvectorDocumentStore:
         return default_from_dict(cls, data)
 
     def _execute_sql(
-        self, sql_query: Query, params: Optional[tuple] = None, error_msg: str = "", cursor: Optional[Cursor] = None
+        self,
+        sql_query: Query,
+        params: Optional[tuple] = None,
+        error_msg: str = "",
+        cursor: Optional[Cursor] = None,
+        local_settings: Optional[Dict[str, Any]] = None,
     ):
         """
         Internal method to execute SQL statements and handle exceptions.
@@ -247,18 +512,32 @@ class PgvectorDocumentStore:
         :param params: The parameters to pass to the SQL query.
         :param error_msg: The error message to use if an exception is raised.
         :param cursor: The cursor to use to execute the SQL query. Defaults to self.cursor.
+        :param local_settings: PostgreSQL settings to change only for this SQL query, like `hnsw.ef_search`.
+            They are changed with `SET LOCAL` in the same transaction as the query, so they don't affect
+            other queries on the same connection.
         """
 
         params = params or ()
         cursor = cursor or self.cursor
 
         sql_query_str = sql_query.as_string(cursor) if not isinstance(sql_query, str) else sql_query
-        logger.debug("SQL query: %s\nParameters: %s", sql_query_str, params)
+        logger.debug("SQL query: %s\nParameters: %s\nLocal settings: %s", sql_query_str, params, local_settings)
 
         try:
-            result = cursor.execute(sql_query, params)
+            if local_settings:
+                # the transaction is rolled back automatically if an error is raised
+                with self.connection.transaction():
+                    for setting_name, setting_value in local_settings.items():
+                        sql_set_local = SQL("SET LOCAL {setting_name} = {setting_value}").format(
+                            setting_name=SQL(setting_name), setting_value=SQLLiteral(setting_value)
+                        )
+                        cursor.execute(sql_set_local)
+                    result = cursor.execute(sql_query, params)
+            else:
+                result = cursor.execute(sql_query, params)
         except Error as e:
-            self.connection.rollback()
+            if not local_settings:
+                self.connection.rollback()
             detailed_error_msg = f"{error_msg}.\nYou can find the SQL query and the parameters in the debug logs."
             raise DocumentStoreError(detailed_error_msg) from e
 
@@ -273,10 +552,49 @@ class PgvectorDocumentStore:
             schema_name=Identifier(self.schema_name),
             table_name=Identifier(self.table_name),
             embedding_dimension=SQLLiteral(self.embedding_dimension),
+            language=SQLLiteral(self.language),
         )
 
         self._execute_sql(create_sql, error_msg="Could not create table in PgvectorDocumentStore")
 
+    def _add_content_tsv_column(self):
+        """
+        Internal method to add the `content_tsv` column to a table created without it.
+        The keyword index of these tables is built on `to_tsvector(language, content)`, so it is dropped
+        to be created again on `content_tsv`. Index names are unique in the whole schema: the index is only dropped
+        if it belongs to this table.
+        """
+
+        logger.warning(
+            "Adding the content_tsv column to table %s.%s: this rewrites the whole table, "
+            "which is locked until it is done",
+            self.schema_name,
+            self.table_name,
+        )
+        sql_add_column = SQL(ADD_CONTENT_TSV_COLUMN_STATEMENT).format(
+            schema_name=Identifier(self.schema_name),
+            table_name=Identifier(self.table_name),
+            language=SQLLiteral(self.language),
+        )
+        sql_drop_index = SQL("DROP INDEX IF EXISTS {schema_name}.{index_name}").format(
+            schema_name=Identifier(self.schema_name),
+            index_name=Identifier(self.keyword_index_name),
+        )
+
+        try:
+            # the transaction is rolled back automatically if an error is raised
+            with self.connection.transaction():
+                self.cursor.execute(sql_add_column)
+                keyword_index_exists = self.cursor.execute(
+                    "SELECT 1 FROM pg_indexes WHERE schemaname = %s AND tablename = %s AND indexname = %s",
+                    (self.schema_name, self.table_name, self.keyword_index_name),
+                ).fetchone()
+                if keyword_index_exists:
+                    self.cursor.execute(sql_drop_index)
+        except Error as e:
+            msg = "Could not add the content_tsv column to the table in PgvectorDocumentStore"
+            raise DocumentStoreError(msg) from e
+
     def delete_table(self):
         """
         Deletes the table used to store Haystack documents.
@@ -296,57 +614,92 @@ class PgvectorDocumentStore:
     def _create_keyword_index_if_not_exists(self):
         """
         Internal method to create the keyword index if not exists.
+        The index is built on the `content_tsv` column. Tables created by older versions don't have it: this is
+        detected by the failure to create the index, without querying the catalog on every connection.
+        Their index is built on `to_tsvector(language, content)`, unless `add_content_tsv_column` is set.
         """
-        index_exists = bool(
-            self._execute_sql(
-                "SELECT 1 FROM pg_indexes WHERE schemaname = %s AND tablename = %s AND indexname = %s",
-                (self.schema_name, self.table_name, self.keyword_index_name),
-                "Could not check if keyword index exists",
-            ).fetchone()
-        )
-
         sql_create_index = SQL(
-            "CREATE INDEX {index_name} ON {schema_name}.{table_name} USING GIN (to_tsvector({language}, content))"
-        ).format(
-            schema_name=Identifier(self.schema_name),
-            index_name=Identifier(self.keyword_index_name),
-            table_name=Identifier(self.table_name),
-            language=SQLLiteral(self.language),
+            "CREATE INDEX IF NOT EXISTS {index_name} ON {schema_name}.{table_name} USING GIN ({content_tsv})"
         )
+        format_kwargs = {
+            "schema_name": Identifier(self.schema_name),
+            "index_name": Identifier(self.keyword_index_name),
+            "table_name": Identifier(self.table_name),
+        }
+        sql_create_index_on_column = sql_create_index.format(content_tsv=SQL("content_tsv"), **format_kwargs)
 
-        if not index_exists:
-            self._execute_sql(sql_create_index, error_msg="Could not create keyword index on table")
+        try:
+            self.cursor.execute(sql_create_index_on_column)
+            self._has_content_tsv_column = True
+            return
+        except UndefinedColumn:
+            pass
+        except Error as e:
+            msg = "Could not create keyword index on table"
+            raise DocumentStoreError(msg) from e
 
-    def _handle_hnsw(self):
+        if self.add_content_tsv_column:
+            self._add_content_tsv_column()
+            self._execute_sql(sql_create_index_on_column, error_msg="Could not create keyword index on table")
+            self._has_content_tsv_column = True
+            return
+
+        logger.info(
+            "Table %s.%s has no content_tsv column: the content is parsed for keyword retrieval at query time. "
+            "Set add_content_tsv_column to add it.",
+            self.schema_name,
+            self.table_name,
+        )
+        content_tsv = SQL("to_tsvector({language}, content)").format(language=SQLLiteral(self.language))
+        self._execute_sql(
+            sql_create_index.format(content_tsv=content_tsv, **format_kwargs),
+            error_msg="Could not create keyword index on table",
+        )
+        self._has_content_tsv_column = False
+
+    def _index_exists(self, index_name: str) -> bool:
         """
-        Internal method to handle the HNSW index creation.
-        It also sets the `hnsw.ef_search` parameter for queries if it is specified.
+        Internal method to check if an index with the given name exists on the table.
+        Index names are unique in the whole schema: if the index belongs to another table, an error is raised,
+        as it can neither be created nor dropped for this table.
         """
 
-        if self.hnsw_ef_search:
-            sql_set_hnsw_ef_search = SQL("SET hnsw.ef_search = {hnsw_ef_search}").format(
-                hnsw_ef_search=SQLLiteral(self.hnsw_ef_search)
+        result = self._execute_sql(
+            "SELECT tablename FROM pg_indexes WHERE schemaname = %s AND indexname = %s",
+            (self.schema_name, index_name),
+            error_msg=f"Could not check if index {index_name} exists",
+        ).fetchone()
+        if result is None:
+            return False
+
+        if result[0] != self.table_name:
+            msg = (
+                f"Index {self.schema_name}.{index_name} already exists on table {self.schema_name}.{result[0]}. "
+                "Choose a different index name for this table."
             )
-            self._execute_sql(sql_set_hnsw_ef_search, error_msg="Could not set hnsw.ef_search")
+            raise DocumentStoreError(msg)
+        return True
 
-        index_exists = bool(
-            self._execute_sql(
-                "SELECT 1 FROM pg_indexes WHERE schemaname = %s AND tablename = %s AND indexname = %s",
-                (self.schema_name, self.table_name, self.hnsw_index_name),
-                "Could not check if HNSW index exists",
-            ).fetchone()
-        )
+    def _handle_hnsw(self):
+        """
+        Internal method to handle the HNSW index creation.
+        The index is created if it doesn't exist yet, or recreated if `hnsw_recreate_index_if_exists` is set.
+        """
 
-        if index_exists and not self.hnsw_recreate_index_if_exists:
-            logger.warning(
-                "HNSW index already exists and won't be recreated. "
-                "If you want to recreate it, pass 'hnsw_recreate_index_if_exists=True' to the "
-                "Document Store constructor"
+        if self._index_exists(self.hnsw_index_name):
+            if not self.hnsw_recreate_index_if_exists:
+                logger.warning(
+                    "HNSW index already exists and won't be recreated. "
+                    "If you want to recreate it, pass 'hnsw_recreate_index_if_exists=True' to the "
+                    "Document Store constructor"
+                )
+                return
+
+            sql_drop_index = SQL("DROP INDEX {schema_name}.{index_name}").format(
+                schema_name=Identifier(self.schema_name),
+                index_name=Identifier(self.hnsw_index_name),
             )
-            return
-
-        sql_drop_index = SQL("DROP INDEX IF EXISTS {index_name}").format(index_name=Identifier(self.hnsw_index_name))
-        self._execute_sql(sql_drop_index, error_msg="Could not drop HNSW index")
+            self._execute_sql(sql_drop_index, error_msg="Could not drop HNSW index")
 
         self._create_hnsw_index()
 
@@ -380,20 +733,98 @@ class PgvectorDocumentStore:
             )
             sql_create_index += sql_add_creation_kwargs
 
-        self._execute_sql(sql_create_index, error_msg="Could not create HNSW index")
+        logger.info(
+            "Creating HNSW index %s with parameters: %s", self.hnsw_index_name, actual_hnsw_index_creation_kwargs
+        )
+
+        # the settings only apply to the index build, not to the other queries on the connection
+        build_settings: Dict[str, Any] = {}
+        if self.hnsw_parallel_workers is not None:
+            build_settings["max_parallel_maintenance_workers"] = int(self.hnsw_parallel_workers)
+        if self.hnsw_maintenance_work_mem is not None:
+            build_settings["maintenance_work_mem"] = str(self.hnsw_maintenance_work_mem)
 
-    def count_documents(self) -> int:
+        self._execute_sql(sql_create_index, error_msg="Could not create HNSW index", local_settings=build_settings)
+
+    def _handle_ivfflat(self):
         """
-        Returns how many documents are present in the document store.
+        Internal method to handle the IVFFlat index creation.
+        The index is created if it doesn't exist yet, or recreated if `ivfflat_recreate_index_if_exists` is set.
+        """
+
+        if self._index_exists(self.ivfflat_index_name):
+            if not self.ivfflat_recreate_index_if_exists:
+                logger.warning(
+                    "IVFFlat index already exists and won't be recreated. "
+                    "If you want to recreate it, pass 'ivfflat_recreate_index_if_exists=True' to the "
+                    "Document Store constructor"
+                )
+                return
+
+            sql_drop_index = SQL("DROP INDEX {schema_name}.{index_name}").format(
+                schema_name=Identifier(self.schema_name),
+                index_name=Identifier(self.ivfflat_index_name),
+            )
+            self._execute_sql(sql_drop_index, error_msg="Could not drop IVFFlat index")
+
+        self._create_ivfflat_index()
+
+    def _create_ivfflat_index(self):
+        """
+        Internal method to create the IVFFlat index.
         """
 
-        sql_count = SQL("SELECT COUNT(*) FROM {schema_name}.{table_name}").format(
-            schema_name=Identifier(self.schema_name), table_name=Identifier(self.table_name)
+        pg_ops = VECTOR_FUNCTION_TO_POSTGRESQL_OPS[self.vector_function]
+        actual_ivfflat_index_creation_kwargs = {
+            key: value
+            for key, value in self.ivfflat_index_creation_kwargs.items()
+            if key in IVFFLAT_INDEX_CREATION_VALID_KWARGS
+        }
+
+        sql_create_index = SQL(
+            "CREATE INDEX {index_name} ON {schema_name}.{table_name} USING ivfflat (embedding {ops}) "
+        ).format(
+            schema_name=Identifier(self.schema_name),
+            index_name=Identifier(self.ivfflat_index_name),
+            table_name=Identifier(self.table_name),
+            ops=SQL(pg_ops),
         )
 
-        count = self._execute_sql(sql_count, error_msg="Could not count documents in PgvectorDocumentStore").fetchone()[
-            0
-        ]
+        if actual_ivfflat_index_creation_kwargs:
+            actual_ivfflat_index_creation_kwargs_str = ", ".join(
+                f"{key} = {value}" for key, value in actual_ivfflat_index_creation_kwargs.items()
+            )
+            sql_add_creation_kwargs = SQL("WITH ({creation_kwargs_str})").format(
+                creation_kwargs_str=SQL(actual_ivfflat_index_creation_kwargs_str)
+            )
+            sql_create_index += sql_add_creation_kwargs
+
+        self._execute_sql(sql_create_index, error_msg="Could not create IVFFlat index")
+
+    def count_documents(self, *, approximate: bool = False) -> int:
+        """
+        Returns how many documents are present in the document store.
+
+        :param approximate: Whether to return the estimate of the number of rows kept by PostgreSQL for the query
+            planner instead of counting them. It is returned immediately even for huge tables, but it's only updated
+            by `VACUUM`, `ANALYZE` and `CREATE INDEX`, so it can be far from the actual number of documents.
+            If the table was never analyzed, the documents are counted.
+            Set it to `False` to get the exact number of documents.
+        """
+
+        if approximate:
+            estimate = self._execute_sql(
+                self._sql_count_estimate,
+                (self.schema_name, self.table_name),
+                error_msg="Could not estimate the number of documents in PgvectorDocumentStore",
+            ).fetchone()
+            # reltuples is -1 until the table is vacuumed or analyzed for the first time
+            if estimate is not None and estimate[0] >= 0:
+                return estimate[0]
+
+        count = self._execute_sql(
+            self._sql_count, error_msg="Could not count documents in PgvectorDocumentStore"
+        ).fetchone()[0]
         return count
 
     def filter_documents(self, filters: Optional[Dict[str, Any]] = None) -> List[Document]:
@@ -407,6 +838,77 @@ class PgvectorDocumentStore:
         :raises TypeError: If `filters` is not a dictionary.
         :returns: A list of Documents that match the given filters.
         """
+        sql_filter, params = self._build_filter_query(filters)
+
+        result = self._execute_sql(
+            sql_filter,
+            params,
+            error_msg="Could not filter documents from PgvectorDocumentStore.",
+            cursor=self.dict_cursor,
+        )
+
+        records = result.fetchall()
+        docs = self._from_pg_to_haystack_documents(records)
+        return docs
+
+    def iter_filter_documents(
+        self, filters: Optional[Dict[str, Any]] = None, batch_size: int = 1000
+    ) -> Iterator[Document]:
+        """
+        Returns an iterator over the documents that match the filters provided.
+
+        Unlike `filter_documents`, the documents are streamed from a server-side cursor in batches of `batch_size`,
+        so that only one batch at a time is kept in memory, and the first documents are returned before the whole
+        query has run. Each iterator uses its own connection to the database, so the Document Store can be used
+        while iterating. Its transaction stays open until the iteration is over or the iterator is closed:
+        until then, the table cannot be dropped or altered, and `VACUUM` cannot remove the rows deleted meanwhile.
+
+        For a detailed specification of the filters,
+        refer to the [documentation](https://docs.haystack.deepset.ai/v2.0/docs/metadata-filtering)
+
+        :param filters: The filters to apply to the document list.
+        :param batch_size: The number of documents fetched from the database at a time.
+        :raises TypeError: If `filters` is not a dictionary.
+        :returns: An iterator over the Documents that match the given filters.
+        """
+        # the filters are validated here, and not when the iteration starts
+        sql_filter, params = self._build_filter_query(filters)
+        return self._iter_documents(sql_filter, params, batch_size)
+
+    def _iter_documents(self, sql_filter: Composed, params: tuple, batch_size: int) -> Iterator[Document]:
+        """
+        Internal method to iterate over the documents returned by a query, using a server-side cursor.
+        The cursor is declared on a separate connection: it only exists in the transaction declaring it,
+        which would otherwise include all the statements run on the Document Store connection while iterating.
+        """
+        logger.debug("SQL query: %s\nParameters: %s", sql_filter.as_string(self.cursor), params)
+
+        connection = None
+        try:
+            # not in autocommit mode: the transaction is started when the cursor is declared
+            connection = connect(self.connection_string.resolve_value() or "")
+            register_vector(connection)
+            cursor = connection.cursor(name="haystack_filter_documents", row_factory=dict_row, binary=True)
+            cursor.execute(sql_filter, params)
+            while records := cursor.fetchmany(batch_size):
+                yield from self._from_pg_to_haystack_documents(records)
+        except Error as e:
+            error_msg = (
+                "Could not filter documents from PgvectorDocumentStore.\n"
+                "You can find the SQL query and the parameters in the debug logs."
+            )
+            raise DocumentStoreError(error_msg) from e
+        finally:
+            # closing the connection ends its transaction, also if the iteration was not completed
+            if connection is not None:
+                connection.close()
+
+    def _build_filter_query(self, filters: Optional[Dict[str, Any]]) -> Tuple[Composed, tuple]:
+        """
+        Internal method to validate the filters and build the query selecting the documents that match them.
+
+        :returns: The query and its parameters.
+        """
         if filters:
             if not isinstance(filters, dict):
                 msg = "Filters must be a dictionary"
@@ -415,25 +917,14 @@ class PgvectorDocumentStore:
                 msg = "Invalid filter syntax. See https://docs.haystack.deepset.ai/docs/metadata-filtering for details."
                 raise ValueError(msg)
 
-        sql_filter = SQL("SELECT * FROM {schema_name}.{table_name}").format(
-            schema_name=Identifier(self.schema_name), table_name=Identifier(self.table_name)
-        )
+        sql_filter = self._sql_select
 
         params = ()
         if filters:
             sql_where_clause, params = _convert_filters_to_where_clause_and_params(filters)
             sql_filter += sql_where_clause
 
-        result = self._execute_sql(
-            sql_filter,
-            params,
-            error_msg="Could not filter documents from PgvectorDocumentStore.",
-            cursor=self.dict_cursor,
-        )
-
-        records = result.fetchall()
-        docs = self._from_pg_to_haystack_documents(records)
-        return docs
+        return sql_filter, params
 
     def write_documents(self, documents: List[Document], policy: DuplicatePolicy = DuplicatePolicy.NONE) -> int:
         """
@@ -456,16 +947,10 @@ class PgvectorDocumentStore:
 
         db_documents = self._from_haystack_to_pg_documents(documents)
 
-        sql_insert = SQL(INSERT_STATEMENT).format(
-            schema_name=Identifier(self.schema_name), table_name=Identifier(self.table_name)
-        )
-
-        if policy == DuplicatePolicy.OVERWRITE:
-            sql_insert += SQL(UPDATE_STATEMENT)
-        elif policy == DuplicatePolicy.SKIP:
-            sql_insert += SQL("ON CONFLICT DO NOTHING")
+        if len(db_documents) >= COPY_WRITE_THRESHOLD:
+            return self._write_documents_with_copy(db_documents, policy)
 
-        sql_insert += SQL(" RETURNING id")
+        sql_insert = self._sql_insert[policy]
 
         sql_query_str = sql_insert.as_string(self.cursor) if not isinstance(sql_insert, str) else sql_insert
         logger.debug("SQL query: %s\nParameters: %s", sql_query_str, db_documents)
@@ -494,6 +979,54 @@ class PgvectorDocumentStore:
 
         return written_docs
 
+    def _write_documents_with_copy(self, db_documents: List[Dict[str, Any]], policy: DuplicatePolicy) -> int:
+        """
+        Internal method to write a large batch of documents.
+
+        The documents are streamed with a binary COPY into a temporary staging table, and then inserted into
+        the documents table with a single statement. The staging table is dropped once the documents are inserted.
+        This avoids a round-trip per document.
+
+        :returns: The number of documents written to the document store.
+        """
+
+        # Documents with an id already written by the same call are counted as written,
+        # like the ones overwritten when writing the documents one by one
+        overwritten_in_batch = 0
+        if policy == DuplicatePolicy.OVERWRITE:
+            # A single INSERT cannot update the same row twice: only the last document with a given id is kept,
+            # as it would be the one left in the table when writing the documents one by one
+            unique_db_documents = list({db_document["id"]: db_document for db_document in db_documents}.values())
+            overwritten_in_batch = len(db_documents) - len(unique_db_documents)
+            db_documents = unique_db_documents
+
+        sql_insert = self._sql_insert_from_staging[policy]
+
+        logger.debug("SQL query: %s\nParameters: %s", sql_insert.as_string(self.cursor), db_documents)
+
+        try:
+            # the transaction is rolled back automatically if an error is raised
+            with self.connection.transaction():
+                self.cursor.execute(self._sql_create_staging_table)
+                with self.cursor.copy(self._sql_copy) as copy:
+                    copy.set_types(COPY_COLUMN_TYPES)
+                    for db_document in db_documents:
+                        copy.write_row([db_document[column] for column in COPY_COLUMNS])
+                self.cursor.execute(sql_insert)
+                written_docs = len(self.cursor.fetchall()) + overwritten_in_batch
+                # ON COMMIT DROP is not enough: in an outer transaction, this block only releases a savepoint
+                self.cursor.execute(self._sql_drop_staging_table)
+        except IntegrityError as ie:
+            raise DuplicateDocumentError from ie
+        except Error as e:
+            error_msg = (
+                "Could not write documents to PgvectorDocumentStore. \n"
+                "You can find the SQL query and the parameters in the debug logs."
+            )
+            raise DocumentStoreError(error_msg) from e
+
+        return written_docs
+
     @staticmethod
     def _from_haystack_to_pg_documents(documents: List[Document]) -> List[Dict[str, Any]]:
         """
@@ -540,21 +1073,45 @@ class PgvectorDocumentStore:
             blob_meta = haystack_dict.pop("blob_meta")
             blob_mime_type = haystack_dict.pop("blob_mime_type")
 
-            # postgresql returns the embedding as a string
-            # so we need to convert it to a list of floats
-            if document.get("embedding") is not None:
-                haystack_dict["embedding"] = document["embedding"].tolist()
+            # the embedding is loaded as a numpy array by the pgvector adapter,
+            # `tolist` converts it to a list of floats in a single call
+            embedding = haystack_dict.get("embedding")
+            if embedding is not None:
+                haystack_dict["embedding"] = embedding.tolist()
 
             haystack_document = Document.from_dict(haystack_dict)
 
             if blob_data:
-                blob = ByteStream(data=blob_data, meta=blob_meta, mime_type=blob_mime_type)
-                haystack_document.blob = blob
+                haystack_document.blob = ByteStream(data=blob_data, meta=blob_meta, mime_type=blob_mime_type)
 
             haystack_documents.append(haystack_document)
 
         return haystack_documents
 
+    @staticmethod
+    def _from_pg_rows_to_haystack_documents(rows: List[Tuple[Any, ...]]) -> List[Document]:
+        """
+        Internal method to convert the rows returned by the retrieval queries to a list of Haystack Documents.
+
+        The rows contain the columns in the order of `DOCUMENT_COLUMNS`, followed by the score.
+        """
+
+        haystack_documents = []
+        for document_id, embedding, content, dataframe, blob_data, blob_meta, blob_mime_type, meta, score in rows:
+            haystack_documents.append(
+                Document(
+                    id=document_id,
+                    content=content,
+                    dataframe=read_json(io.StringIO(dataframe)) if dataframe is not None else None,
+                    blob=ByteStream(data=blob_data, meta=blob_meta, mime_type=blob_mime_type) if blob_data else None,
+                    meta=meta or {},
+                    score=score,
+                    embedding=embedding.tolist() if embedding is not None else None,
+                )
+            )
+
+        return haystack_documents
+
     def delete_documents(self, document_ids: List[str]) -> None:
         """
         Deletes documents that match the provided `document_ids` from the document store.
@@ -565,15 +1122,27 @@ class PgvectorDocumentStore:
         if not document_ids:
             return
 
-        document_ids_str = ", ".join(f"'{document_id}'" for document_id in document_ids)
+        # the ids are passed as an array parameter, so that the query is the same for any number of ids
+        delete_sql = self._sql_delete
 
-        delete_sql = SQL("DELETE FROM {schema_name}.{table_name} WHERE id IN ({document_ids_str})").format(
-            schema_name=Identifier(self.schema_name),
-            table_name=Identifier(self.table_name),
-            document_ids_str=SQL(document_ids_str),
-        )
+        # large deletions are split into several statements, which are pipelined by `executemany`
+        # and run in a single transaction
+        batches = [
+            (list(document_ids[i : i + DELETE_BATCH_SIZE]),) for i in range(0, len(document_ids), DELETE_BATCH_SIZE)
+        ]
 
-        self._execute_sql(delete_sql, error_msg="Could not delete documents from PgvectorDocumentStore")
+        logger.debug("SQL query: %s\nParameters: %s", delete_sql.as_string(self.cursor), batches)
+
+        try:
+            # the transaction is rolled back automatically if an error is raised
+            with self.connection.transaction():
+                self.cursor.executemany(delete_sql, batches)
+        except Error as e:
+            error_msg = (
+                "Could not delete documents from PgvectorDocumentStore.\n"
+                "You can find the SQL query and the parameters in the debug logs."
+            )
+            raise DocumentStoreError(error_msg) from e
 
     def _keyword_retrieval(
         self,
@@ -595,12 +1164,9 @@ class PgvectorDocumentStore:
             msg = "query must be a non-empty string"
             raise ValueError(msg)
 
-        sql_select = SQL(KEYWORD_QUERY).format(
-            schema_name=Identifier(self.schema_name),
-            table_name=Identifier(self.table_name),
-            language=SQLLiteral(self.language),
-            query=SQLLiteral(query),
-        )
+        # the connection is created first, as it detects whether the table has the `content_tsv` column
+        cursor = self.tuple_cursor
+        sql_select = self._sql_keyword_select[self._has_content_tsv_column]
 
         where_params = ()
         sql_where_clause = SQL("")
@@ -617,11 +1183,11 @@ class PgvectorDocumentStore:
             sql_query,
             (query, *where_params),
             error_msg="Could not retrieve documents from PgvectorDocumentStore.",
-            cursor=self.dict_cursor,
+            cursor=cursor,
         )
 
         records = result.fetchall()
-        docs = self._from_pg_to_haystack_documents(records)
+        docs = self._from_pg_rows_to_haystack_documents(records)
         return docs
 
     def _embedding_retrieval(
@@ -631,6 +1197,7 @@ class PgvectorDocumentStore:
         filters: Optional[Dict[str, Any]] = None,
         top_k: int = 10,
         vector_function: Optional[Literal["cosine_similarity", "inner_product", "l2_distance"]] = None,
+        hnsw_ef_search: Optional[int] = None,
     ) -> List[Document]:
         """
         Retrieves documents that are most similar to the query embedding using a vector similarity metric.
@@ -639,6 +1206,13 @@ class PgvectorDocumentStore:
         `PgvectorDocumentStore` and it should not be called directly.
         `PgvectorEmbeddingRetriever` uses this method directly and is the public interface for it.
 
+        With the `"hnsw"` and `"ivfflat"` search strategies, the filtered queries don't use the index:
+        the documents matching the filters are selected first, and then sorted by similarity,
+        so that `top_k` documents are returned even when the filters only match a few documents.
+
+        :param hnsw_ef_search: The `ef_search` parameter to use for this query. Only used if search_strategy is set
+            to `"hnsw"`. Defaults to the `hnsw_ef_search` of the Document Store.
+
         :returns: List of Documents that are most similar to `query_embedding`
         """
 
@@ -654,51 +1228,75 @@ class PgvectorDocumentStore:
 
         vector_function = vector_function or self.vector_function
         if vector_function not in VALID_VECTOR_FUNCTIONS:
-            msg = f"vector_function must be one of {VALID_VECTOR_FUNCTIONS}, but got {vector_function}"
+            msg = f"vector_function must be one of {sorted(VALID_VECTOR_FUNCTIONS)}, but got {vector_function}"
             raise ValueError(msg)
 
-        # the vector must be a string with this format: "'[3,1,2]'"
-        query_embedding_for_postgres = f"'[{','.join(str(el) for el in query_embedding)}]'"
+        if self.search_strategy in ["hnsw", "ivfflat"] and vector_function != self.vector_function:
+            logger.warning(
+                "The %s index was created for '%s', but '%s' is used in this query: "
+                "the index can't be used and all the documents will be scanned.",
+                self.search_strategy,
+                self.vector_function,
+                vector_function,
+            )
 
-        # to compute the scores, we use the approach described in pgvector README:
-        # https://github.com/pgvector/pgvector?tab=readme-ov-file#distances
-        # cosine_similarity and inner_product are modified from the result of the operator
-        if vector_function == "cosine_similarity":
-            score_definition = f"1 - (embedding <=> {query_embedding_for_postgres}) AS score"
-        elif vector_function == "inner_product":
-            score_definition = f"(embedding <#> {query_embedding_for_postgres}) * -1 AS score"
-        elif vector_function == "l2_distance":
-            score_definition = f"embedding <-> {query_embedding_for_postgres} AS score"
+        # the query embedding is passed as a parameter: as a numpy array, it is sent
+        # with the binary vector format registered by `register_vector`
+        query_embedding_for_postgres = np.asarray(query_embedding, dtype=np.float32)
 
-        sql_select = SQL("SELECT *, {score} FROM {schema_name}.{table_name}").format(
-            schema_name=Identifier(self.schema_name),
-            table_name=Identifier(self.table_name),
-            score=SQL(score_definition),
-        )
+        sql_select = self._sql_embedding_select[vector_function]
 
         sql_where_clause = SQL("")
-        params = ()
+        where_params = ()
         if filters:
-            sql_where_clause, params = _convert_filters_to_where_clause_and_params(filters)
-
-        # we always want to return the most similar documents first
-        # so when using l2_distance, the sort order must be ASC
-        sort_order = "ASC" if vector_function == "l2_distance" else "DESC"
-
-        sql_sort = SQL(" ORDER BY score {sort_order} LIMIT {top_k}").format(
-            top_k=SQLLiteral(top_k),
-            sort_order=SQL(sort_order),
-        )
+            sql_where_clause, where_params = _convert_filters_to_where_clause_and_params(filters)
+
+        # we sort by the distance operator instead of the score, as the HNSW index is only used
+        # for an ascending ORDER BY on the operator itself.
+        # The smallest distance always comes first, as `<#>` returns the negative inner product
+        sql_operator = SQL(VECTOR_FUNCTION_TO_POSTGRESQL_OPERATOR[vector_function])
+
+        local_settings: Dict[str, Any] = {}
+        if filters and self.search_strategy in ["hnsw", "ivfflat"]:
+            # The index scan returns the `ef_search` or `probes` nearest documents and only then applies the filters,
+            # so selective filters leave fewer than `top_k` documents.
+            # The documents matching the filters are selected first instead, and only those are sorted.
+            # MATERIALIZED prevents PostgreSQL from merging the two queries back into the index scan.
+            # Only the ids and embeddings are kept, the other columns are read for the `top_k` nearest documents.
+            sql_nearest = SQL(
+                "WITH filtered AS MATERIALIZED (SELECT id, embedding FROM {schema_name}.{table_name}{where_clause}), "
+                "nearest AS (SELECT id, embedding {operator} %s AS distance FROM filtered ORDER BY distance "
+                "LIMIT {top_k}) "
+            ).format(
+                schema_name=Identifier(self.schema_name),
+                table_name=Identifier(self.table_name),
+                where_clause=sql_where_clause,
+                operator=sql_operator,
+                top_k=SQLLiteral(top_k),
+            )
+            sql_query = sql_nearest + sql_select + SQL(" JOIN nearest USING (id) ORDER BY nearest.distance")
+            params = (*where_params, query_embedding_for_postgres, query_embedding_for_postgres)
+        else:
+            sql_sort = SQL(" ORDER BY embedding {operator} %s LIMIT {top_k}").format(
+                operator=sql_operator, top_k=SQLLiteral(top_k)
+            )
+            sql_query = sql_select + sql_where_clause + sql_sort
+            params = (query_embedding_for_postgres, *where_params, query_embedding_for_postgres)
 
-        sql_query = sql_select + sql_where_clause + sql_sort
+            hnsw_ef_search = hnsw_ef_search or self.hnsw_ef_search
+            if self.search_strategy == "hnsw" and hnsw_ef_search:
+                local_settings["hnsw.ef_search"] = int(hnsw_ef_search)
+            elif self.search_strategy == "ivfflat" and self.ivfflat_probes:
+                local_settings["ivfflat.probes"] = int(self.ivfflat_probes)
 
         result = self._execute_sql(
             sql_query,
             params,
             error_msg="Could not retrieve documents from PgvectorDocumentStore.",
-            cursor=self.dict_cursor,
+            cursor=self.tuple_cursor,
+            local_settings=local_settings,
         )
 
         records = result.fetchall()
-        docs = self._from_pg_to_haystack_documents(records)
+        docs = self._from_pg_rows_to_haystack_documents(records)
         return docs
@@ -58,10 +58,17 @@ class TestEmbeddingRetriever:
                         "search_strategy": "exact_nearest_neighbor",
                         "hnsw_recreate_index_if_exists": False,
                         "language": "english",
-                        "hnsw_index_creation_kwargs": {},
+                        "hnsw_index_creation_kwargs": {"m": 16, "ef_construction": 128},
                         "hnsw_index_name": "haystack_hnsw_index",
                         "hnsw_ef_search": None,
+                        "hnsw_parallel_workers": None,
+                        "hnsw_maintenance_work_mem": None,
+                        "ivfflat_recreate_index_if_exists": False,
+                        "ivfflat_index_creation_kwargs": {},
+                        "ivfflat_index_name": "haystack_ivfflat_index",
+                        "ivfflat_probes": None,
                         "keyword_index_name": "haystack_keyword_index",
+                        "add_content_tsv_column": False,
                     },
                 },
                 "filters": {"field": "value"},
@@ -88,9 +95,11 @@ class TestEmbeddingRetriever:
                         "recreate_table": True,
                         "search_strategy": "exact_nearest_neighbor",
                         "hnsw_recreate_index_if_exists": False,
-                        "hnsw_index_creation_kwargs": {},
+                        "hnsw_index_creation_kwargs": {"m": 16, "ef_construction": 128},
                         "hnsw_index_name": "haystack_hnsw_index",
                         "hnsw_ef_search": None,
+                        "hnsw_parallel_workers": None,
+                        "hnsw_maintenance_work_mem": None,
                         "keyword_index_name": "haystack_keyword_index",
                     },
                 },
@@ -112,7 +121,7 @@ class TestEmbeddingRetriever:
         assert document_store.recreate_table
         assert document_store.search_strategy == "exact_nearest_neighbor"
         assert not document_store.hnsw_recreate_index_if_exists
-        assert document_store.hnsw_index_creation_kwargs == {}
+        assert document_store.hnsw_index_creation_kwargs == {"m": 16, "ef_construction": 128}
         assert document_store.hnsw_index_name == "haystack_hnsw_index"
         assert document_store.hnsw_ef_search is None
         assert document_store.keyword_index_name == "haystack_keyword_index"
@@ -184,10 +193,17 @@ class TestKeywordRetriever:
                         "search_strategy": "exact_nearest_neighbor",
                         "hnsw_recreate_index_if_exists": False,
                         "language": "english",
-                        "hnsw_index_creation_kwargs": {},
+                        "hnsw_index_creation_kwargs": {"m": 16, "ef_construction": 128},
                         "hnsw_index_name": "haystack_hnsw_index",
                         "hnsw_ef_search": None,
+                        "hnsw_parallel_workers": None,
+                        "hnsw_maintenance_work_mem": None,
+                        "ivfflat_recreate_index_if_exists": False,
+                        "ivfflat_index_creation_kwargs": {},
+                        "ivfflat_index_name": "haystack_ivfflat_index",
+                        "ivfflat_probes": None,
                         "keyword_index_name": "haystack_keyword_index",
+                        "add_content_tsv_column": False,
                     },
                 },
                 "filters": {"field": "value"},
@@ -213,9 +229,11 @@ class TestKeywordRetriever:
                         "recreate_table": True,
                         "search_strategy": "exact_nearest_neighbor",
                         "hnsw_recreate_index_if_exists": False,
-                        "hnsw_index_creation_kwargs": {},
+                        "hnsw_index_creation_kwargs": {"m": 16, "ef_construction": 128},
                         "hnsw_index_name": "haystack_hnsw_index",
                         "hnsw_ef_search": None,
+                        "hnsw_parallel_workers": None,
+                        "hnsw_maintenance_work_mem": None,
                         "keyword_index_name": "haystack_keyword_index",
                     },
                 },
@@ -236,7 +254,7 @@ class TestKeywordRetriever:
         assert document_store.recreate_table
         assert document_store.search_strategy == "exact_nearest_neighbor"
         assert not document_store.hnsw_recreate_index_if_exists
-        assert document_store.hnsw_index_creation_kwargs == {}
+        assert document_store.hnsw_index_creation_kwargs == {"m": 16, "ef_construction": 128}
         assert document_store.hnsw_index_name == "haystack_hnsw_index"
         assert document_store.hnsw_ef_search is None
         assert document_store.keyword_index_name == "haystack_keyword_index"
@@ -261,9 +279,11 @@ class TestKeywordRetriever:
                         "recreate_table": True,
                         "search_strategy": "exact_nearest_neighbor",
                         "hnsw_recreate_index_if_exists": False,
-                        "hnsw_index_creation_kwargs": {},
+                        "hnsw_index_creation_kwargs": {"m": 16, "ef_construction": 128},
                         "hnsw_index_name": "haystack_hnsw_index",
                         "hnsw_ef_search": None,
+                        "hnsw_parallel_workers": None,
+                        "hnsw_maintenance_work_mem": None,
                         "keyword_index_name": "haystack_keyword_index",
                     },
                 },
@@ -283,7 +303,7 @@ class TestKeywordRetriever:
         assert document_store.recreate_table
         assert document_store.search_strategy == "exact_nearest_neighbor"
         assert not document_store.hnsw_recreate_index_if_exists
-        assert document_store.hnsw_index_creation_kwargs == {}
+        assert document_store.hnsw_index_creation_kwargs == {"m": 16, "ef_construction": 128}
         assert document_store.hnsw_index_name == "haystack_hnsw_index"
         assert document_store.hnsw_ef_search is None
         assert document_store.keyword_index_name == "haystack_keyword_index"